@@ -0,0 +1,117 @@
+"""A memory benchmark, which generates world 1-1 and compares how many bytes
+each of its entities takes up with the slotted entity classes, against the
+same entities holding the same attributes in a __dict__, as they did before
+the entity classes had slots.
+
+Run this from the root of the repository, the same way as game.py. It runs
+headless, and its logs are written into a temporary directory that is
+removed afterwards."""
+
+import copy
+import gc
+import importlib
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+# Run without opening a window or an audio device.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import engine
+import engine.logger
+import lostlevels
+import lostlevels.scenes
+
+# The world and level that is generated.
+WORLD = 1
+LEVEL = 1
+
+# Get the attributes of an entity, from its slots and its __dict__ if it has one.
+def get_attributes(ent):
+    attributes = dict()
+    for cls in reversed(type(ent).__mro__):
+        for name in cls.__dict__.get("__slots__", ()):
+            # Slots with private names are stored under their mangled names.
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{cls.__name__.lstrip('_')}{name}"
+            if hasattr(ent, name):
+                attributes[name] = getattr(ent, name)
+    attributes.update(getattr(ent, "__dict__", dict()))
+    return attributes
+
+# Copy each entity into an object of an unslotted class with the same name,
+# which keeps the same attributes in its __dict__.
+def copy_unslotted(ents):
+    classes = dict()
+    copies = []
+    for ent in ents:
+        if type(ent) not in classes:
+            classes[type(ent)] = type(type(ent).__name__, (), dict())
+        obj = classes[type(ent)]()
+        for name, value in get_attributes(ent).items():
+            setattr(obj, name, value)
+        copies.append(obj)
+    return copies
+
+# Copy each entity, keeping its slotted class.
+def copy_slotted(ents):
+    return [copy.copy(ent) for ent in ents]
+
+# Return the number of bytes that are still allocated after calling a function,
+# alongside what it returned.
+def measure(func, *args):
+    gc.collect()
+    start = tracemalloc.get_traced_memory()[0]
+    result = func(*args)
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - start, result
+
+# Generate the level and measure it.
+def benchmark(eng, game):
+    # Select the level.
+    game.world = WORLD
+    game.level = LEVEL
+    game.levelmodule = importlib.import_module(f"lostlevels.worlds.{WORLD}.{LEVEL}")
+
+    # Generate the level once beforehand, so that tile sheets, fonts and sounds are
+    # already cached.
+    lostlevels.scenes.Level(eng, game)
+    eng.clear_foreground_elements()
+    eng.clear_entities()
+
+    # Generate the level again, and copy its entities with and without slots,
+    # tracing every allocation.
+    tracemalloc.start()
+    size, level = measure(lostlevels.scenes.Level, eng, game)
+    ents = list(eng.registry.entities)
+    slotted, copies = measure(copy_slotted, ents)
+    del copies
+    unslotted, copies = measure(copy_unslotted, ents)
+    del copies
+    tracemalloc.stop()
+
+    # Report the bytes per entity.
+    count = len(ents)
+    print(f"World {WORLD}-{LEVEL}: {count} entities")
+    print(f"  level:                 {size / count:.1f} bytes per entity")
+    print(f"  entities with slots:   {slotted / count:.1f} bytes per entity")
+    print(f"  entities with __dict__: {unslotted / count:.1f} bytes per entity")
+    print(f"  level with __dict__:   {(size - slotted + unslotted) / count:.1f} bytes per entity")
+
+# Write the logs into a temporary directory, then instantiate the engine and
+# run the benchmark headless.
+logs = tempfile.mkdtemp()
+engine.logger.Logger.directory = logs
+try:
+    eng = engine.LLEngine("Lost Levels")
+    game = lostlevels.LostLevels(eng)
+    eng.set_game(game)
+    eng.prepare()
+    benchmark(eng, game)
+    eng.console.close()
+    pygame.quit()
+finally:
+    shutil.rmtree(logs, ignore_errors=True)
@@ -2,5 +2,6 @@ from .main import LLEngine
 from .game_interface import Game
 from .sound import Sound
 from .event import Event
+from . import governor
 from . import entity
 from . import ui
\ No newline at end of file
@@ -2,4 +2,7 @@ from .entity import *
 from .rect import Rectangle
 from .tile import Tile
 from .sprite import Sprite
-from .physics import *
\ No newline at end of file
+from .physics import *
+from .registry import *
+from .components import *
+from .tilemap import *
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""The component store, which keeps the physics state of entities (origin,
+hitbox, velocity, move, friction, acceleration and movetype) in contiguous
+NumPy arrays, one row per entity, so that it can be operated on in bulk.
+
+The component store is optional and requires NumPy. Entities that are not in a
+component store keep their state in their own attributes."""
+
+import pygame
+
+# NumPy is an optional dependency, only required for the component store.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Named constants defining default component store properties.
+DEFAULT_CAPACITY = 256
+
+# A view into a row of a 2D component array, which behaves like a Vector2.
+# Writing to x or y writes to the component store.
+class VectorView():
+    __slots__ = ("__store", "__name", "__row")
+
+    # Construct a new view into a row of a component array.
+    def __init__(self, store, name, row):
+        self.__store = store
+        self.__name = name
+        self.__row = row
+
+    # Get the x component.
+    @property
+    def x(self):
+        return getattr(self.__store, self.__name).item(self.__row, 0)
+
+    # Set the x component.
+    @x.setter
+    def x(self, value):
+        getattr(self.__store, self.__name)[self.__row, 0] = value
+
+    # Get the y component.
+    @property
+    def y(self):
+        return getattr(self.__store, self.__name).item(self.__row, 1)
+
+    # Set the y component.
+    @y.setter
+    def y(self, value):
+        getattr(self.__store, self.__name)[self.__row, 1] = value
+
+    # Return a copy of this view as a Vector2.
+    def copy(self):
+        return pygame.math.Vector2(self.x, self.y)
+
+    # Sequence and arithmetic operators, which return Vector2s.
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index):
+        return (self.x, self.y)[index]
+
+    def __iter__(self):
+        return iter((self.x, self.y))
+
+    def __add__(self, other):
+        return self.copy() + other
+
+    def __radd__(self, other):
+        return other + self.copy()
+
+    def __sub__(self, other):
+        return self.copy() - other
+
+    def __rsub__(self, other):
+        return other - self.copy()
+
+    def __mul__(self, other):
+        return self.copy() * other
+
+    def __rmul__(self, other):
+        return other * self.copy()
+
+    def __truediv__(self, other):
+        return self.copy() / other
+
+    def __neg__(self):
+        return -self.copy()
+
+    def __eq__(self, other):
+        return self.copy() == other
+
+    def __ne__(self, other):
+        return self.copy() != other
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    # Any other Vector2 methods are called on a copy of this view.
+    def __getattr__(self, name):
+        return getattr(self.copy(), name)
+
+# Component store class.
+class ComponentStore():
+    # Construct a new component store.
+    def __init__(self, capacity = DEFAULT_CAPACITY):
+        self.__capacity = 0
+        self.origin = numpy.zeros((0, 2))
+        self.hitbox = numpy.zeros((0, 2))
+        self.velocity = numpy.zeros((0, 2))
+        self.move = numpy.zeros(0)
+        self.friction = numpy.zeros(0)
+        self.acceleration = numpy.zeros(0)
+        self.movetype = numpy.zeros(0, dtype=numpy.int8)
+        self.used = numpy.zeros(0, dtype=bool)
+
+        # The entity stored in each row, and the rows that are free.
+        self.entities = []
+        self.__free = []
+        self.__grow(capacity)
+
+    # Grow every array to a new capacity.
+    def __grow(self, capacity):
+        def grow(array):
+            grown = numpy.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+            grown[:len(array)] = array
+            return grown
+        self.origin = grow(self.origin)
+        self.hitbox = grow(self.hitbox)
+        self.velocity = grow(self.velocity)
+        self.move = grow(self.move)
+        self.friction = grow(self.friction)
+        self.acceleration = grow(self.acceleration)
+        self.movetype = grow(self.movetype)
+        self.used = grow(self.used)
+        self.entities.extend([None] * (capacity - self.__capacity))
+        self.__free.extend(range(capacity - 1, self.__capacity - 1, -1))
+        self.__capacity = capacity
+
+    # Get the number of rows in every array.
+    def get_capacity(self):
+        return self.__capacity
+
+    # Move an entity's state into a new row of this store.
+    def add(self, ent):
+        # Double the capacity if there are no free rows.
+        if not self.__free:
+            self.__grow(self.__capacity * 2)
+        row = self.__free.pop()
+        self.write(row, ent)
+        self.used[row] = True
+        self.entities[row] = ent
+        ent._attach(self, row)
+        return row
+
+    # Move an entity's state out of this store, back into its own attributes.
+    def remove(self, ent):
+        row = ent._detach()
+        self.used[row] = False
+        self.entities[row] = None
+        self.__free.append(row)
+
+    # Move the state of every entity out of this store.
+    def clear(self):
+        for ent in self.entities:
+            if ent:
+                self.remove(ent)
+
+    # Write the state of an entity into a row.
+    def write(self, row, ent):
+        self.origin[row] = tuple(ent.get_baseorigin())
+        self.hitbox[row] = tuple(ent.get_hitbox())
+        self.velocity[row] = tuple(ent.velocity)
+        self.move[row] = ent.move
+        self.friction[row] = ent.friction
+        self.acceleration[row] = ent.acceleration
+        self.movetype[row] = ent.movetype
+
+    # Get the rows of every entity in this store.
+    def rows(self):
+        return numpy.flatnonzero(self.used)
+
+# Define what should be imported from this module.
+__all__ = ["ComponentStore", "VectorView"]
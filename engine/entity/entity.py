@@ -4,7 +4,7 @@ These are the moving objects in a game, using this engine."""
 
 import pygame
 from ..event import Event
-from .physics import CELL_SIZE
+from .components import VectorView
 
 # Move types.
 MOVETYPE_NONE       = 0 # This entity is not recognised by the physics engine.
@@ -13,13 +13,33 @@ MOVETYPE_ANCHORED   = 1 # This entity is recognised by the physics engine, but w
 MOVETYPE_PHYSICS    = 2 # This entity will be manipulated by the physics engine.
 MOVETYPE_CUSTOM     = 3 # Custom physics is written for this entity.
 
-# The root entity class.
+# The root entity class. Entities use slots instead of a __dict__ to keep them
+# compact, so subclasses should declare any attributes they add in their own
+# __slots__ tuple. Subclasses that don't declare __slots__ still work, but
+# each of their entities will carry a __dict__ again.
 class Entity():
+    __slots__ = ("__classname", "__events", "entid", "_registry", "_rect", "_engine",
+                 "active", "draw", "can_use", "__velocity", "__baseorigin", "__origindisp",
+                 "__hitbox", "__basevelocity", "groundentity", "__movetype", "__move",
+                 "__friction", "__acceleration", "dirty", "prev", "next", "deleted",
+                 "grid", "gridhashes", "gridrange", "drawgrid", "_components", "_row", "_queryepoch",
+                 "_index", "_serial")
+
+    # Events shared by every entity of this class, keyed by name. An entity only
+    # gets its own copy of an event once it is retrieved through get_event().
+    default_events = dict()
+
     # Construct a new entity.
     def __init__(self, engine, classname = "entity"):
         # Set some basic identifiable attributes for this entity.
         self.__classname = classname
-        self.__events = dict()
+        self.__events = None    # Events of this entity copied from the class defaults.
+        self.entid = None       # The id of this entity, assigned by the entity registry.
+        self._registry = None   # The entity registry that this entity is in.
+        self._index = None      # The index of this entity in the registry's dense list.
+        self._serial = None     # The number of entities added to the registry before this one.
+        self._components = None # The component store that holds the motion of this entity.
+        self._row = None        # The row of this entity in the component store.
         self._rect = pygame.Rect(0, 0, 0, 0)
         self._engine = engine
         self.active = False
@@ -27,43 +47,141 @@ class Entity():
         self.can_use = False
 
         # Entity motion.
-        self.velocity = pygame.math.Vector2()       # The entity velocity as described by itself.
+        self.__velocity = pygame.math.Vector2()     # The entity velocity as described by itself.
         self.__baseorigin = pygame.math.Vector2()   # The entity position as described by itself.
         self.__origindisp = pygame.math.Vector2()   # Displacement to add onto the base origin.
         self.__hitbox = pygame.math.Vector2()       # The size of the hitbox of the entity.
 
         # Physics engine properties.
         self.groundentity = None                    # The entity that this entity is grounded on.
-        self.movetype = MOVETYPE_NONE               # The default movetype of this entity.
-        self.move = 0.00                            # Scalar quantity representing horizontal movement, bound to friction.
-        self.friction = 1.00                        # Friction multiplier.
-        self.acceleration = 4.5                     # Acceleration multiplier.
+        self.__movetype = MOVETYPE_NONE             # The default movetype of this entity.
+        self.__move = 0.00                          # Scalar quantity representing horizontal movement, bound to friction.
+        self.__friction = 1.00                      # Friction multiplier.
+        self.__acceleration = 4.5                   # Acceleration multiplier.
         self.dirty = False                          # Has the origin of the entity changed?
 
-        # Create a few crucial events.
-        self.set_event(Event("draw", placeholder))
-        self.set_event(Event("activated", lambda self: None))
-        self.set_event(Event("per_frame", lambda self: None))
-        self.set_event(Event("collision", lambda self, other, coltype, coldir: True))
-        self.set_event(Event("collisionfinal", lambda self, other, coltype, coldir: None))
-        self.set_event(Event("use", lambda self: None))
-
         # Engine linked list implementation.
         self.prev = None
         self.next = None
         self.deleted = False # Set to True after this entity is unlinked.
 
         # Reference hashes for the scene grid.
+        self.grid = None
         self.gridhashes = None
+        self.gridrange = None
         self.drawgrid = False
+        self._queryepoch = 0    # The last spatial hash grid query that returned this entity.
+
+    # Set an event that is shared by every entity of this class and its subclasses,
+    # unless they have their own copy.
+    @classmethod
+    def set_default_event(cls, event):
+        if "default_events" not in cls.__dict__:
+            cls.default_events = dict(cls.default_events)
+        cls.default_events[event.get_name()] = event
 
     # Get the class name of this entity.
     def get_class(self):
         return self.__classname
+
+    # Get the movetype of this entity.
+    @property
+    def movetype(self):
+        return self.__movetype
+
+    # Set the movetype of this entity, re-indexing it in the entity registry.
+    @movetype.setter
+    def movetype(self, movetype):
+        old = self.__movetype
+        self.__movetype = movetype
+        if self._row != None:
+            self._components.movetype[self._row] = movetype
+        if self._registry and old != movetype:
+            self._registry.movetype_changed(self, old)
+
+    # Get the velocity of this entity.
+    @property
+    def velocity(self):
+        if self._row == None:
+            return self.__velocity
+        return VectorView(self._components, "velocity", self._row)
+
+    # Set the velocity of this entity.
+    @velocity.setter
+    def velocity(self, vec):
+        if self._row == None:
+            self.__velocity = vec
+        else:
+            self._components.velocity[self._row] = (vec.x, vec.y)
+
+    # Get the horizontal movement of this entity.
+    @property
+    def move(self):
+        if self._row == None:
+            return self.__move
+        return self._components.move.item(self._row)
+
+    # Set the horizontal movement of this entity.
+    @move.setter
+    def move(self, move):
+        if self._row == None:
+            self.__move = move
+        else:
+            self._components.move[self._row] = move
+
+    # Get the friction multiplier of this entity.
+    @property
+    def friction(self):
+        if self._row == None:
+            return self.__friction
+        return self._components.friction.item(self._row)
+
+    # Set the friction multiplier of this entity.
+    @friction.setter
+    def friction(self, friction):
+        if self._row == None:
+            self.__friction = friction
+        else:
+            self._components.friction[self._row] = friction
+
+    # Get the acceleration multiplier of this entity.
+    @property
+    def acceleration(self):
+        if self._row == None:
+            return self.__acceleration
+        return self._components.acceleration.item(self._row)
+
+    # Set the acceleration multiplier of this entity.
+    @acceleration.setter
+    def acceleration(self, acceleration):
+        if self._row == None:
+            self.__acceleration = acceleration
+        else:
+            self._components.acceleration[self._row] = acceleration
+
+    # Attach this entity to a row of a component store, which its motion has
+    # been written to.
+    def _attach(self, components, row):
+        self._components = components
+        self._row = row
+
+    # Detach this entity from its component store, reading its motion back
+    # into its own attributes, and return the row it was in.
+    def _detach(self):
+        row = self._row
+        self.__baseorigin = self.get_baseorigin()
+        self.__hitbox = self.get_hitbox()
+        self.__velocity = self.velocity.copy()
+        self.__move = self.move
+        self.__friction = self.friction
+        self.__acceleration = self.acceleration
+        self._components = None
+        self._row = None
+        return row
     
     # Get the absolute origin of this entity.
     def get_absorigin(self):
-        return self.__baseorigin + self.__origindisp
+        return self.get_baseorigin() + self.__origindisp
     
     # Get the top-left absolute origin of this entity.
     def get_abstopleft(self):
@@ -93,41 +211,50 @@ class Entity():
     # Get the top-right base origin of this entity.
     def get_topright(self):
         origin = self.get_baseorigin()
-        return pygame.math.Vector2(origin.x + self.__hitbox.x,
+        return pygame.math.Vector2(origin.x + self.get_hitbox().x,
                                    origin.y)
     
     # Get the bottom-left base origin of this entity.
     def get_bottomleft(self):
         origin = self.get_baseorigin()
         return pygame.math.Vector2(origin.x,
-                                   origin.y - self.__hitbox.y)
+                                   origin.y - self.get_hitbox().y)
     
     # Get the bottom-right base origin of this entity.
     def get_bottomright(self):
         origin = self.get_baseorigin()
-        return pygame.math.Vector2(origin.x + self.__hitbox.x,
-                                   origin.y - self.__hitbox.y)
+        return pygame.math.Vector2(origin.x + self.get_hitbox().x,
+                                   origin.y - self.get_hitbox().y)
     
     # Get the centre absolute origin of this entity.
     def get_centre(self):
         origin = self.get_baseorigin()
-        return pygame.math.Vector2(origin.x + self.__hitbox.x / 2,
-                                   origin.y - self.__hitbox.y / 2)
+        return pygame.math.Vector2(origin.x + self.get_hitbox().x / 2,
+                                   origin.y - self.get_hitbox().y / 2)
     
     # Get the absolute origin of the entity as window co-ordinates.
     def get_absorigin_coord(self):
         origin = self.get_absorigin()
         return (origin.x, -origin.y)
 
-    # Get the base origin of this entity.
+    # Get the base origin of this entity. This is a value, not a view into the
+    # component store, so it doesn't change when the entity is moved.
     def get_baseorigin(self):
-        return self.__baseorigin
+        if self._row == None:
+            return self.__baseorigin
+        origin = self._components.origin
+        return pygame.math.Vector2(origin.item(self._row, 0), origin.item(self._row, 1))
     
     # Set the base origin of this entity.
     def set_baseorigin(self, vec):
-        if vec != self.__baseorigin:
+        if vec != self.get_baseorigin():
             self.dirty = True
-        self.__baseorigin = vec
+            if self._registry:
+                self._registry.moved[self] = None
+        if self._row == None:
+            self.__baseorigin = vec
+        else:
+            self._components.origin[self._row] = (vec.x, vec.y)
         absorigin = self.get_absorigin()
         self._rect.left = absorigin.x
         self._rect.top = -absorigin.y
@@ -151,13 +278,25 @@ class Entity():
     def set_basevelocity(self, vec):
         self.__basevelocity = vec
 
-    # Get the hitbox of this entity.
+    # Get the hitbox of this entity. This is a value, not a view into the
+    # component store, so it doesn't change when the entity is resized.
     def get_hitbox(self):
-        return self.__hitbox
+        if self._row == None:
+            return self.__hitbox
+        hitbox = self._components.hitbox
+        return pygame.math.Vector2(hitbox.item(self._row, 0), hitbox.item(self._row, 1))
 
-    # Set the hitbox of this entity.
+    # Set the hitbox of this entity. Like moving it, this changes the grid cells
+    # that the entity covers.
     def set_hitbox(self, vec):
-        self.__hitbox = vec
+        if vec != self.get_hitbox():
+            self.dirty = True
+            if self._registry:
+                self._registry.moved[self] = None
+        if self._row == None:
+            self.__hitbox = vec
+        else:
+            self._components.hitbox[self._row] = (vec.x, vec.y)
         self._rect.w = vec.x
         self._rect.h = vec.y
     
@@ -175,20 +314,47 @@ class Entity():
     def collides(self, other):
         return self._rect.colliderect(other._rect)
 
-    # Retrieve an event from this entity.
+    # Retrieve an event from this entity. Events shared with the class are copied
+    # first, as the event is usually retrieved to be modified.
     def get_event(self, name):
-        if name not in self.__events:
+        if self.__events and name in self.__events:
+            return self.__events[name]
+        if name not in self.default_events:
             self._engine.console.warn(f"Entity {self.__classname}: could not find event \"{name}\"")
             return None
-        return self.__events[name]
+        return self.set_event(self.default_events[name].copy())
+
+    # Find an event of this entity without copying it, or None if it doesn't exist.
+    def __find_event(self, name):
+        if self.__events and name in self.__events:
+            return self.__events[name]
+        return self.default_events.get(name)
 
     # Set an event to this entity.
     def set_event(self, event):
+        if self.__events == None:
+            self.__events = dict()
         self.__events[event.get_name()] = event
+        event.listener = self._event_changed
+        self._event_changed(event)
+        return event
+
+    # Upon an event of this entity changing, re-register this entity for ticking
+    # if its per-frame event changed.
+    def _event_changed(self, event):
+        if self._registry and event.get_name() == "per_frame":
+            self._registry.tick_changed(self)
+
+    # Check if this entity has to be ticked, i.e. if its per-frame event does
+    # anything.
+    def ticks(self):
+        event = self.__find_event("per_frame")
+        return event != None and (event.get_func() != idle or event.has_hooks())
 
     # Invoke an event.
     def invoke_event(self, name, *args):
-        if (event := self.get_event(name)) == None:
+        if (event := self.__find_event(name)) == None:
+            self._engine.console.warn(f"Entity {self.__classname}: could not find event \"{name}\"")
             return None
         return event.invoke(self, *args)
 
@@ -201,27 +367,31 @@ class Entity():
 
     # Draw all the grid cells this entity is in for debugging purposes.
     def draw_grid(self, background):
-        # Walk through each grid hash.
-        for hash in self.gridhashes:
-            # Deserialize the cell indexes from the grid hash and retrieve the cell size.
-            xindex, yindex = map(int, hash.split(':'))
-            left, top = xindex * CELL_SIZE[0], -yindex * CELL_SIZE[1]
-
-            # Draw the grid cell.
+        # Walk through the area of each grid cell and draw it.
+        for rect in self._engine.get_cell_rects(self):
             pygame.draw.polygon(background, (255, 255, 255), [
-                                    (left, top),
-                                    (left + CELL_SIZE[0], top),
-                                    (left + CELL_SIZE[0], top + CELL_SIZE[1]),
-                                    (left, top + CELL_SIZE[1])
+                                    rect.topleft, rect.topright, rect.bottomright, rect.bottomleft
                                 ], 1)
         if self.__classname == "sprite":
             pass
                                 
 
+# Default per-frame function, which does nothing. Entities using it are not ticked.
+def idle(entity):
+    pass
+
 # Placeholder function.
 def placeholder(sprite, *args):
     sprite._engine.console.log(f"Entity {sprite.get_class()}: engine/entity/entity.py placeholder function called!")
 
+# Create a few crucial events.
+Entity.set_default_event(Event("draw", placeholder))
+Entity.set_default_event(Event("activated", lambda self: None))
+Entity.set_default_event(Event("per_frame", idle))
+Entity.set_default_event(Event("collision", lambda self, other, coltype, coldir: True))
+Entity.set_default_event(Event("collisionfinal", lambda self, other, coltype, coldir: None))
+Entity.set_default_event(Event("use", lambda self: None))
+
 # Define what should be imported from this module.
 __all__ = ["Entity", "MOVETYPE_NONE", "MOVETYPE_ANCHORED", 
            "MOVETYPE_PHYSICS", "MOVETYPE_CUSTOM"]
\ No newline at end of file
@@ -13,6 +13,10 @@ that has been defined to be under the influence of this engine."""
 import pygame
 import math 
 from . import entity
+from . import components
+from . import tilemap
+from .tile import Tile
+from .rect import Rectangle
 from .. import gvar
 
 # Named constants defining default engine properties.
@@ -20,6 +24,10 @@ DEFAULT_GRAVITY = 1350
 DEFAULT_FRICTION = 800
 DEFAULT_MINHEIGHT = -1000
 CELL_SIZE = (75, 75)
+GRID_LEVELS = 5
+SLIDE_ITERATIONS = 3
+DEFAULT_MAXSTEP = 1 / 30
+DEFAULT_MAXSUBSTEPS = 8
 
 # Flags for defining collision.
 COLTYPE_COLLIDING = 0   # This entity is colliding another entity.
@@ -29,34 +37,53 @@ COLDIR_RIGHT = 1        # This entity is colliding/being collided from the right
 COLDIR_UP = 2           # This entity is colliding/being collided from upwards.
 COLDIR_DOWN = 3         # This entity is colliding/being collided from downwards.
 
+# Sweep a box along a displacement against another box, where boxes are tuples of
+# their left, bottom, right and top sides. Returns the time of impact, as a fraction
+# of the displacement, and whether the boxes meet on the horizontal axis, or None if
+# they don't meet. Boxes that already overlap, or that only touch at a corner or
+# slide along each other's sides, don't meet.
+def sweep(box, other, dx, dy):
+    # Calculate the times at which the boxes start and stop overlapping on each axis.
+    entry, exit = [], []
+    for low, high, otherlow, otherhigh, d in ((box[0], box[2], other[0], other[2], dx),
+                                               (box[1], box[3], other[1], other[3], dy)):
+        if d > 0:
+            entry.append((otherlow - high) / d)
+            exit.append((otherhigh - low) / d)
+        elif d < 0:
+            entry.append((otherhigh - low) / d)
+            exit.append((otherlow - high) / d)
+        elif high > otherlow and low < otherhigh:
+            entry.append(-math.inf)
+            exit.append(math.inf)
+        else:
+            return None
+
+    # The boxes meet when they start overlapping on both axes during the displacement.
+    # The axis that starts overlapping last is the one that they meet on.
+    toi = max(entry)
+    if toi < 0 or toi > 1 or toi >= min(exit):
+        return None
+    return toi, entry[0] > entry[1]
+
 # Spatial hash grid implementation, which will be responsible for organizing
 # entities.
 class SpatialHashGrid():
-    # A doubly-linked list for each cell, which will contain each grid node.
-    # Grid nodes consist of the actual entity value, alongside the previous/next
-    # node object references.
-    class List():
-        # Grid node class.
-        class GridNode():
-            def __init__(self, value):
-                # Store the entity itself.
-                self.value = value
-
-                # Store the previous/next nodes for the doubly-linked list.
-                self.prev = None
-                self.next = None
-
-        # Constructor for a new cells list.
-        def __init__(self):
-            self.head = None
-            self.tail = None
+    # Each cell is a list of the entities in it. Every entity keeps a dictionary
+    # mapping the keys of the cells it is in to its slot in each cell's list, so that
+    # it can be removed by swapping the last entity of the cell into its slot.
+
+    # The number of queries made across every grid, used for rejecting duplicate
+    # entities in a query. It is shared so that an entity which moves to another
+    # grid can't carry over a stamp that matches that grid's next query.
+    __epoch = 0
 
     # Construct a new spatial hash grid.
     def __init__(self, cellsize):
         # Create a new hashmap (i.e. dictionary) to track all the cells. The
         # origin cell will be initialized by default.
         self.cells = {
-            "0:0": SpatialHashGrid.List()
+            (0, 0): []
         }
 
         # Store the cell size as a separate vector.
@@ -64,45 +91,12 @@ class SpatialHashGrid():
 
     # Insert an entity into this grid.
     def insert(self, entity):
-        # Retrieve the minimum and maximum cell indexes for this entity.
-        min_indexes = self.__get_indexes(entity.get_baseorigin())   # Top-left corner
-        max_indexes = self.__get_indexes(pygame.math.Vector2(       # Bottom-right corner
-                                            entity.get_baseorigin().x + entity.get_hitbox().x,
-                                            entity.get_baseorigin().y - entity.get_hitbox().y
-                                        ))                          
-
-        # Loop through the x/y co-ordinates to generate a list of hashes for all the cells
-        # this entity is in, and thus adding the entity to each cell.
+        # Add the entity to every cell between its top-left and bottom-right corners.
+        entity.grid = self
         entity.gridhashes = dict()
-        y = min_indexes[1]
-        while y >= max_indexes[1]:
-            x = min_indexes[0]
-            while x <= max_indexes[0]:
-                # Create a new hash.
-                hash = self.__get_hash((x, y))
-
-                # Create a new cell for this hash if it doesn't exist.
-                if hash not in self.cells:
-                    self.cells[hash] = SpatialHashGrid.List()
-
-                # Insert this entity to the respective cell.
-                node = SpatialHashGrid.List.GridNode(entity)
-                node.prev = self.cells[hash].tail
-                if node.prev:
-                    node.prev.next = node
-                node.next = None
-                if not self.cells[hash].head:
-                    self.cells[hash].head = node
-                self.cells[hash].tail = node
-
-                # Update the entity's grid hashes dictionary.
-                entity.gridhashes[hash] = node
-
-                # Update the x co-ordinate.
-                x += 1
-            
-            # Update the y co-ordinate.
-            y -= 1
+        entity.gridrange = self.__get_range(entity)
+        for cell in self.__get_range_cells(entity.gridrange):
+            self.__add(entity, cell)
 
         # Unmark the entity as dirty.
         entity.dirty = False
@@ -110,96 +104,183 @@ class SpatialHashGrid():
     # Remove an entity from this grid, on the assumption that it is 
     # either being updated or it is being deleted.
     def remove(self, entity):
-        # Loop through each grid node for this entity and update the linked list.
-        for hash in entity.gridhashes:
-            # Get the grid node for this hash.
-            node = entity.gridhashes[hash]
-
-            # Update the grid node's linked list.
-            if node.prev:
-                node.prev.next = node.next
-            else:
-                self.cells[hash].head = node.next
-            if node.next:
-                node.next.prev = node.prev
-            else:
-                self.cells[hash].tail = node.prev
-            
-            # Delete the node.
-            del node
+        # Ignore entities that aren't in this grid.
+        if entity.gridhashes == None:
+            return
+
+        # Remove the entity from each of its cells.
+        for cell, slot in entity.gridhashes.items():
+            self.__discard(entity, cell, slot)
 
         # Nullify the entity's grid hashes dictionary.
+        entity.grid = None
         entity.gridhashes = None
+        entity.gridrange = None
+
+    # Add an entity to the end of a cell, creating the cell if it doesn't exist.
+    def __add(self, entity, cell):
+        members = self.cells.get(cell)
+        if members == None:
+            members = self.cells[cell] = []
+        entity.gridhashes[cell] = len(members)
+        members.append(entity)
+
+    # Remove an entity from the given slot of a cell, moving the last entity of
+    # the cell into its place. Cells are deleted once they are empty.
+    def __discard(self, entity, cell, slot):
+        members = self.cells[cell]
+        last = members.pop()
+        if last != entity:
+            members[slot] = last
+            last.gridhashes[cell] = slot
+        elif not members:
+            del self.cells[cell]
+
+    # For a given set of start/end points forming a rectangle, iterate over all
+    # the entities within the grid cells that are found within said rectangle.
+    # Each entity is only yielded once, which is tracked by stamping it with the
+    # current query epoch. Starting another query before this one is exhausted
+    # will therefore cause duplicates, so use query_entities() if the caller may
+    # query the grid while iterating.
+    def iter_entities(self, start, end, include_nocollide = False):
+        # Start a new query epoch.
+        SpatialHashGrid.__epoch += 1
+        epoch = SpatialHashGrid.__epoch
 
-    # For a given set of start/end points forming a rectangle, return all the 
-    # entities within the grid cells that are found within said rectangle.
-    def query_entities(self, start, end, include_nocollide = False):
         # Acquire the minimum/maximum cell indexes for the given start/end points.
-        hashes = []
         min_indexes = self.__get_indexes(start)
         max_indexes = self.__get_indexes(end)
+        xstep = 1 if max_indexes[0] >= min_indexes[0] else -1
+        ystep = 1 if max_indexes[1] >= min_indexes[1] else -1
+
+        # Loop through each cell included or inbetween, and yield every entity in
+        # each cell that hasn't been yielded yet.
+        for y in range(min_indexes[1], max_indexes[1] + ystep, ystep):
+            for x in range(min_indexes[0], max_indexes[0] + xstep, xstep):
+                for ent in self.cells.get((x, y), ()):
+                    if (ent._queryepoch != epoch
+                        and (include_nocollide or ent.movetype != entity.MOVETYPE_NONE)):
+                        ent._queryepoch = epoch
+                        yield ent
+
+    # For a given set of start/end points forming a rectangle, return a list of all
+    # the entities within the grid cells that are found within said rectangle.
+    def query_entities(self, start, end, include_nocollide = False):
+        return list(self.iter_entities(start, end, include_nocollide))
 
-        # Loop through the indexes and generate hashes for all the cells included
-        # or inbetween.
-        y, y_hit = min_indexes[1], False
-        while not y_hit:
-            # Confirm whether the y-index is the max index.
-            if y == max_indexes[1]:
-                y_hit = True
-            
-            # Loop through each x-index.
-            x, x_hit = min_indexes[0], False
-            while not x_hit:
-                # Confirm whether the x-index is the max index.
-                if x == max_indexes[0]:
-                    x_hit = True
-
-                # Generate a hash and insert it.
-                hash = self.__get_hash((x, y))
-                hashes.append(hash)
-                
-                # Update the x co-ordinate.
-                x = x + 1 if max_indexes[0] > min_indexes[0] else x - 1
-
-            # Update the y co-ordinate.
-            y = y + 1 if max_indexes[1] > min_indexes[1] else y - 1
-
-        # Now, loop through each cell and profile a list of all the entities in each cell.
-        entities = []
-        for hash in hashes:
-            if hash not in self.cells:
-                continue
-            node = self.cells[hash].head
-            while node:
-                if (node.value not in entities
-                    and ((not include_nocollide and node.value.movetype != entity.MOVETYPE_NONE)
-                         or include_nocollide)):
-                    entities.append(node.value)
-                node = node.next
-
-        # Return all the queried entities.
-        return entities
-
-    # Update an entity.
+    # Update an entity. Only the cells that the entity has left or entered are
+    # changed, so nothing is done if it still covers the same cells.
     def update(self, entity):
-        self.remove(entity)
-        self.insert(entity)
+        # Insert the entity if it isn't in this grid yet.
+        if entity.gridhashes == None:
+            self.insert(entity)
+            return
+
+        # Compare the range of cells the entity covers with the range it was in.
+        old, new = entity.gridrange, self.__get_range(entity)
+        entity.dirty = False
+        if new == old:
+            return
+
+        # Remove the entity from the cells it has left, and add it to the cells it
+        # has entered.
+        for cell in self.__get_range_cells(old):
+            if not self.__in_range(cell, new):
+                self.__discard(entity, cell, entity.gridhashes.pop(cell))
+        for cell in self.__get_range_cells(new):
+            if not self.__in_range(cell, old):
+                self.__add(entity, cell)
+        entity.gridrange = new
 
     # Reset this grid, thus removing all entities from it.
     def reset(self):
+        for members in self.cells.values():
+            for ent in members:
+                ent.grid = None
+                ent.gridhashes = None
+                ent.gridrange = None
         self.cells = {
-            "0:0": SpatialHashGrid.List()
+            (0, 0): []
         }
 
+    # Iterate over the keys of the cells that an entity is in.
+    def get_cells(self, entity):
+        return iter(entity.gridhashes or ())
+
+    # Get the size of each cell.
+    def get_cell_size(self):
+        return self.__cellsize
+
+    # Return a list of all the entities in this grid.
+    def get_entities(self):
+        return list({ent: None for members in self.cells.values() for ent in members})
+
+    # Get the area of a cell, as a rect in window co-ordinates.
+    def get_cell_rect(self, cell):
+        width, height = int(self.__cellsize.x), int(self.__cellsize.y)
+        return pygame.Rect(cell[0] * width, -(cell[1] + 1) * height, width, height)
+
+    # Return the range of cells that an entity covers, as the indexes of the cells
+    # of its top-left and bottom-right corners.
+    def __get_range(self, entity):
+        origin, hitbox = entity.get_baseorigin(), entity.get_hitbox()
+        return (*self.__get_indexes(origin),
+                *self.__get_indexes(pygame.math.Vector2(origin.x + hitbox.x, origin.y - hitbox.y)))
+
+    # Iterate over the keys of the cells in a range.
+    def __get_range_cells(self, cells):
+        for y in range(cells[1], cells[3] - 1, -1):
+            for x in range(cells[0], cells[2] + 1):
+                yield (x, y)
+
+    # Check if a cell is within a range of cells.
+    def __in_range(self, cell, cells):
+        return cells[0] <= cell[0] <= cells[2] and cells[3] <= cell[1] <= cells[1]
+
     # Return the indexes of the cell a given point is located in.
     def __get_indexes(self, point):
-        return (int(math.copysign(abs(point.x) // self.__cellsize.x, point.x)), 
-                int(math.copysign(abs(point.y) // self.__cellsize.y, point.y)))
+        return (int(point.x // self.__cellsize.x), int(point.y // self.__cellsize.y))
+
+# Hierarchical grid implementation, which organizes entities of mixed sizes. It is
+# made of spatial hash grids whose cell sizes double from one level to the next, and
+# each entity goes into the lowest level whose cells are at least as large as it, so
+# that it covers no more than 2x2 cells. Entities are inserted into their level
+# directly, and keep it as their grid.
+class HierarchicalGrid():
+    # Construct a new hierarchical grid, given the cell size of its lowest level.
+    def __init__(self, cellsize, levels = GRID_LEVELS):
+        self.levels = [SpatialHashGrid(cellsize * 2 ** i) for i in range(levels)]
+
+    # Get the level that an entity belongs in, based on its size. Entities larger
+    # than the cells of every level go into the top level.
+    def get_level(self, entity):
+        hitbox = entity.get_hitbox()
+        for level in self.levels:
+            cellsize = level.get_cell_size()
+            if hitbox.x <= cellsize.x and hitbox.y <= cellsize.y:
+                return level
+        return self.levels[-1]
+
+    # For a given set of start/end points forming a rectangle, iterate over all
+    # the entities within the cells of each level that are found within said
+    # rectangle.
+    def iter_entities(self, start, end, include_nocollide = False):
+        for level in self.levels:
+            yield from level.iter_entities(start, end, include_nocollide)
+
+    # For a given set of start/end points forming a rectangle, return a list of all
+    # the entities within the cells of each level that are found within said rectangle.
+    def query_entities(self, start, end, include_nocollide = False):
+        return list(self.iter_entities(start, end, include_nocollide))
+
+    # Reset every level, thus removing all entities from this grid.
+    def reset(self):
+        for level in self.levels:
+            level.reset()
 
-    # Construct a hash for a cell's indexes.
-    def __get_hash(self, indexes):
-        # Return a hash based on the cell indexes the point is based in.
-        return f"{indexes[0]}:{indexes[1]}"
+    # Return a list of all the entities in this grid.
+    def get_entities(self):
+        return [ent for level in self.levels for ent in level.get_entities()]
 
 # The physics engine, responsible for handling each entity's physics.
 class LLPhysics():
@@ -216,48 +297,389 @@ class LLPhysics():
         self.__minheight = self.__engine.create_gvar("minheight", -1000,
                                                      "Entities that fall below this height will be killed.",
                                                      gvar.GVAR_PROGRAMONLY)
+        self.__use_tilemap = self.__engine.create_gvar("use_tilemap", 0,
+                                                       "Collide with map tiles through a NumPy tilemap.")
+        self.__maxstep = self.__engine.create_gvar("maxstep", DEFAULT_MAXSTEP,
+                                                   "The longest physics substep, in seconds.", min=0.001)
+        self.__maxsubsteps = self.__engine.create_gvar("maxsubsteps", DEFAULT_MAXSUBSTEPS,
+                                                       "The most physics substeps in a frame. Frame time "
+                                                       "beyond them is skipped.", min=1)
         
-        # Create a new spatial hash grid for organizing all entities.
-        self.__grid = SpatialHashGrid(pygame.math.Vector2(CELL_SIZE))
-
-    # Insert an entity into the spatial hash grid.
-    def insert_entity(self, entity):
-        return self.__grid.insert(entity)
+        # Create new hierarchical grids for organizing all entities. Entities that
+        # don't move by themselves go into the static grid, which only changes when
+        # one of them is moved, while MOVETYPE_PHYSICS and MOVETYPE_CUSTOM entities
+        # go into the dynamic grid. Scenes may change the cell size of the grids.
+        self.__static = HierarchicalGrid(pygame.math.Vector2(CELL_SIZE))
+        self.__dynamic = HierarchicalGrid(pygame.math.Vector2(CELL_SIZE))
+
+        # The tilemap, which holds grid-aligned map tiles instead of the static grid.
+        # It is created when it is first used.
+        self.__tilemap = None
+
+        # The smallest width and height of any colliding entity inserted since the
+        # grids were last cleared, which decide how many substeps fast entities need.
+        self.__smallest = pygame.math.Vector2(math.inf, math.inf)
+
+        # Colliders made by merging map tiles, each mapped to a dictionary of the
+        # tiles it was merged from keyed by their tile cells, and each merged tile
+        # mapped to its collider. Colliders belong to the physics engine alone,
+        # rather than being entities of the engine.
+        self.__colliders = dict()
+        self.__merged = dict()
+
+    # Get the tilemap that new tiles should be added to, or None if the tilemap
+    # is disabled.
+    def __get_tilemap(self):
+        if not self.__use_tilemap.get():
+            return None
+
+        # Create the tilemap when it is first used, as long as NumPy is installed.
+        if self.__tilemap == None:
+            if tilemap.numpy == None:
+                self.__engine.console.warn("use_tilemap requires NumPy, which is not installed.")
+                self.__use_tilemap.set(0)
+                return None
+            self.__tilemap = tilemap.TileMap()
+        return self.__tilemap
+
+    # Get the grid that an entity belongs in, based on its movetype and size. Map
+    # tiles go into the tilemap if it accepts them.
+    def __get_grid(self, ent):
+        if ent.movetype >= entity.MOVETYPE_PHYSICS:
+            return self.__dynamic.get_level(ent)
+        tiles = self.__get_tilemap()
+        if tiles and tiles.accepts(ent):
+            return tiles
+        return self.__static.get_level(ent)
+
+    # Set the cell size of the lowest level of the grids, moving the entities in
+    # them into the new grids. Larger cells make queries cheaper but leave more
+    # entities in each cell.
+    def set_cell_size(self, cellsize):
+        ents = self.__static.get_entities() + self.__dynamic.get_entities()
+        self.__static.reset()
+        self.__dynamic.reset()
+        self.__static = HierarchicalGrid(pygame.math.Vector2(cellsize))
+        self.__dynamic = HierarchicalGrid(pygame.math.Vector2(cellsize))
+        for ent in ents:
+            self.__get_grid(ent).insert(ent)
+
+    # Update an entity in the spatial hash grid that it belongs in, moving it across
+    # from another grid if its movetype or size has changed.
+    def __update(self, ent):
+        grid = self.__get_grid(ent)
+        if ent.grid and ent.grid != grid:
+            ent.grid.remove(ent)
+        grid.update(ent)
+
+    # Insert an entity into the spatial hash grids. Tiles that have been merged
+    # are stood in for by their collider, which goes into the grids along with the
+    # first of its tiles to be inserted.
+    def insert_entity(self, ent):
+        if ent in self.__merged:
+            ent = self.__merged[ent]
+            if ent.grid:
+                return
+        if ent.movetype != entity.MOVETYPE_NONE:
+            hitbox = ent.get_hitbox()
+            if hitbox.x > 0:
+                self.__smallest.x = min(self.__smallest.x, hitbox.x)
+            if hitbox.y > 0:
+                self.__smallest.y = min(self.__smallest.y, hitbox.y)
+        if ent.grid:
+            ent.grid.remove(ent)
+        return self.__get_grid(ent).insert(ent)
     
-    # Remove an entity from the spatial hash grid.
-    def remove_entity(self, entity):
-        self.__grid.remove(entity)
-
-    # Per-frame method which runs physics code on each entity.
+    # Remove an entity from the spatial hash grids. Removing a merged tile splits
+    # its collider up around it.
+    def remove_entity(self, ent):
+        if ent.grid:
+            ent.grid.remove(ent)
+        if ent in self.__merged:
+            self.__split_collider(self.__merged.pop(ent), ent)
+
+    # Merge contiguous map tiles that collide the same way into larger colliders.
+    # This is meant to be done once a level has been loaded, before its tiles are
+    # activated. The tiles are still drawn, but only the colliders go into the
+    # grids. Nothing is merged while the tilemap is in use, as it already holds
+    # map tiles as cheaply.
+    def merge_colliders(self, ents):
+        if self.__get_tilemap():
+            return
+        tiles = dict()
+        for ent in ents:
+            if self.__can_merge(ent):
+                tiles.setdefault(self.__get_tile_cell(ent), ent)
+        self.__merge(tiles)
+
+    # Check if an entity is a map tile that can be merged with other tiles. It must
+    # be an anchored, solid tile that exactly covers a tile cell, and whose flags
+    # don't call for any callbacks.
+    def __can_merge(self, ent):
+        if (not isinstance(ent, Tile) or ent.movetype != entity.MOVETYPE_ANCHORED or ent.deleted
+            or not ent.tileflags & tilemap.TILE_SOLID
+            or ent.tileflags & (tilemap.TILE_ONEWAY | tilemap.TILE_SPIKED) or ent in self.__merged):
+            return False
+        origin, hitbox = ent.get_baseorigin(), ent.get_hitbox()
+        size = tilemap.TILE_SIZE
+        return hitbox.x == size and hitbox.y == size and not origin.x % size and not origin.y % size
+
+    # Get the key of the tile cell that a map tile covers.
+    def __get_tile_cell(self, ent):
+        origin = ent.get_baseorigin()
+        return (int(origin.x // tilemap.TILE_SIZE), int(origin.y // tilemap.TILE_SIZE))
+
+    # Greedily merge a dictionary of map tiles, keyed by their tile cells, into
+    # colliders. Starting from the top-left tile, each collider grows as far right
+    # as it can, and then as far down as the whole width allows. Only tiles with
+    # the same flags and friction are merged.
+    def __merge(self, tiles):
+        for cell in sorted(tiles, key=lambda cell: (-cell[1], cell[0])):
+            ent = tiles.get(cell)
+            if not ent:
+                continue
+            def matches(other):
+                return other and other.tileflags == ent.tileflags and other.friction == ent.friction
+
+            # Grow the rectangle of tiles to the right, and then downwards.
+            width, height = 1, 1
+            while matches(tiles.get((cell[0] + width, cell[1]))):
+                width += 1
+            while all(matches(tiles.get((cell[0] + x, cell[1] - height))) for x in range(width)):
+                height += 1
+
+            # Take the tiles out, and merge them if there is more than one.
+            members = dict()
+            for y in range(height):
+                for x in range(width):
+                    members[(cell[0] + x, cell[1] - y)] = tiles.pop((cell[0] + x, cell[1] - y))
+            if len(members) > 1:
+                bounds = (cell[0], cell[1] - height + 1, cell[0] + width - 1, cell[1])
+                self.__create_collider(members, bounds, False)
+
+    # Get the bounds of a collider, as the columns and rows of the tile cells at
+    # its bottom-left and top-right corners.
+    def __get_bounds(self, collider):
+        left, bottom, right, top = self.__get_box(collider)
+        size = tilemap.TILE_SIZE
+        return (int(left // size), int(bottom // size) + 1, int(right // size) - 1, int(top // size))
+
+    # Set the origin and hitbox of a collider to cover the given bounds.
+    def __set_bounds(self, collider, bounds):
+        left, bottom, right, top = bounds
+        collider.set_hitbox(pygame.math.Vector2(right - left + 1, top - bottom + 1) * tilemap.TILE_SIZE)
+        collider.set_baseorigin(pygame.math.Vector2(left, top) * tilemap.TILE_SIZE)
+
+    # Create a collider standing in for a dictionary of map tiles, keyed by their
+    # tile cells, which fill the given bounds.
+    def __create_collider(self, members, bounds, activate):
+        collider = Rectangle(self.__engine, "collider")
+        collider.draw = False
+        collider.friction = next(iter(members.values())).friction
+        self.__set_bounds(collider, bounds)
+        for tile in members.values():
+            if tile.grid:
+                tile.grid.remove(tile)
+            self.__merged[tile] = collider
+        self.__colliders[collider] = members
+        if activate:
+            self.insert_entity(collider)
+
+    # Split up the collider of a merged tile that is being removed. The rest of
+    # its tiles fill up to four rectangles around the tile: the columns to its
+    # left and right, and the rest of its own column below and above it. The
+    # collider shrinks down to the largest rectangle, so removing a tile from its
+    # edge only shrinks it, while new colliders are only created for the others.
+    # Tiles that are left on their own go back into the grids by themselves.
+    def __split_collider(self, collider, removed):
+        members = self.__colliders[collider]
+        col, row = self.__get_tile_cell(removed)
+        del members[(col, row)]
+        left, bottom, right, top = self.__get_bounds(collider)
+        parts = [(left, bottom, col - 1, top), (col + 1, bottom, right, top),
+                 (col, bottom, col, row - 1), (col, row + 1, col, top)]
+        parts = [part for part in parts if part[0] <= part[2] and part[1] <= part[3]]
+        parts.sort(key=lambda part: (part[2] - part[0] + 1) * (part[3] - part[1] + 1), reverse=True)
+
+        # Take the tiles of each rectangle but the largest out of the collider.
+        active = collider.grid != None
+        for part in parts[1:]:
+            tiles = dict()
+            for x in range(part[0], part[2] + 1):
+                for y in range(part[1], part[3] + 1):
+                    tiles[(x, y)] = members.pop((x, y))
+            if len(tiles) > 1:
+                self.__create_collider(tiles, part, active)
+                continue
+            tile = tiles.popitem()[1]
+            del self.__merged[tile]
+            if active and tile.active and not tile.deleted:
+                self.insert_entity(tile)
+
+        # Shrink the collider down to the largest rectangle, or drop it if there
+        # is only one tile left.
+        if len(members) > 1:
+            self.__set_bounds(collider, parts[0])
+            if active:
+                self.__update(collider)
+            return
+        if collider.grid:
+            collider.grid.remove(collider)
+        del self.__colliders[collider]
+        for tile in members.values():
+            del self.__merged[tile]
+            if active and tile.active and not tile.deleted:
+                self.insert_entity(tile)
+
+    # Get the merged tile of a collider that is nearest to a point, or the entity
+    # itself if it isn't a collider. This is the tile that gets reported as hit.
+    def __get_member(self, ent, x, y):
+        members = self.__colliders.get(ent)
+        if members == None:
+            return ent
+        left, bottom, right, top = self.__get_bounds(ent)
+        size = tilemap.TILE_SIZE
+        col = min(max(math.floor(x / size), left), right)
+        row = min(max(math.ceil(y / size), bottom), top)
+        return members[(col, row)]
+
+    # Iterate over the merged tiles of a collider within the tile cells found
+    # within the given rectangle.
+    def __iter_members(self, collider, start, end):
+        members = self.__colliders[collider]
+        left, bottom, right, top = self.__get_bounds(collider)
+        size = tilemap.TILE_SIZE
+        for x in range(max(math.floor(min(start.x, end.x) / size), left),
+                       min(math.floor(max(start.x, end.x) / size), right) + 1):
+            for y in range(max(math.ceil(min(start.y, end.y) / size), bottom),
+                           min(math.ceil(max(start.y, end.y) / size), top) + 1):
+                yield members[(x, y)]
+
+    # Iterate over the areas of the grid cells that an entity is in, as rects in
+    # window co-ordinates.
+    def get_cell_rects(self, ent):
+        if not ent.grid:
+            return
+        for cell in ent.grid.get_cells(ent):
+            yield ent.grid.get_cell_rect(cell)
+
+    # Apply gravity, friction and acceleration to every active MOVETYPE_PHYSICS
+    # entity in the component store at once, and return the set of entities that
+    # were integrated, over a given step of time.
+    def __integrate_batch(self, frametime):
+        # Gather the rows of the entities, alongside the friction of the entities
+        # they are grounded on.
+        store = self.__engine.components
+        bodies, rows, grounded, groundfriction = set(), [], [], []
+        for ent in self.__engine.registry.by_movetype(entity.MOVETYPE_PHYSICS):
+            if ent.active and ent._components == store:
+                bodies.add(ent)
+                rows.append(ent._row)
+                grounded.append(bool(ent.groundentity))
+                groundfriction.append(ent.groundentity.friction if ent.groundentity else 1.0)
+        if not rows:
+            return bodies
+        np = components.numpy
+        rows = np.array(rows)
+        grounded = np.array(grounded)
+        groundfriction = np.array(groundfriction)
+        velocity = store.velocity[rows]
+        move = store.move[rows]
+        friction = store.friction[rows]
+
+        # Inflict gravity upon the entities.
+        velocity[:, 1] -= self.__gravity.get() * frametime
+
+        # Handle friction for the grounded entities, scaling their horizontal speed
+        # down towards zero.
+        speed = np.abs(velocity[:, 0])
+        newspeed = np.maximum(0, speed - self.__friction.get() * groundfriction * friction * frametime)
+        scale = np.divide(newspeed, speed, out=np.zeros_like(speed), where=speed > 0)
+        velocity[:, 0] = np.where(grounded, velocity[:, 0] * scale, velocity[:, 0])
+
+        # Accelerate the entities based on their move values, capping the acceleration
+        # so that they don't exceed their maximum speeds.
+        difference = move - velocity[:, 0]
+        difference[np.copysign(move, difference) != move] = 0
+        acceleration = store.acceleration[rows] * frametime * move * friction * groundfriction
+        capped = np.abs(acceleration) > np.abs(difference)
+        acceleration[capped] = difference[capped]
+        velocity[:, 0] += acceleration
+
+        # Write the new velocities back to the component store.
+        store.velocity[rows] = velocity
+        return bodies
+
+    # Per-frame method which runs physics code on each entity. The frame is split
+    # into substeps, so that no substep is longer than maxstep and no entity moves
+    # further than the width or height of the smallest collider in one substep. There
+    # are at most maxsubsteps substeps, and any frame time beyond them is skipped.
     def per_frame(self):
-        # Walk through each entity in the engine's entity list.
-        ent = self.__engine.entity_head()
-        while (ent):
+        frametime = self.__engine.globals.frametime
+        substeps = self.__get_substeps(frametime)
+        step = frametime / substeps
+        if substeps > self.__maxsubsteps.get():
+            substeps = int(self.__maxsubsteps.get())
+            step = min(frametime / substeps, self.__maxstep.get())
+
+        # Report the substeps taken and the frame time that was skipped.
+        skipped = max(frametime - step * substeps, 0)
+        self.__engine.globals.substeps = substeps
+        self.__engine.globals.skipped_time = skipped
+        self.__engine.globals.skipped_total += skipped
+
+        for i in range(substeps):
+            self.__step(step)
+
+    # Get the number of substeps that a frame needs, before it is capped.
+    def __get_substeps(self, frametime):
+        fastest = pygame.math.Vector2(0, 0)
+        for movetype in (entity.MOVETYPE_CUSTOM, entity.MOVETYPE_PHYSICS):
+            for ent in self.__engine.registry.by_movetype(movetype):
+                if ent.active:
+                    fastest.x = max(fastest.x, abs(ent.velocity.x))
+                    fastest.y = max(fastest.y, abs(ent.velocity.y))
+        substeps = max(frametime / self.__maxstep.get(),
+                       fastest.x * frametime / self.__smallest.x,
+                       fastest.y * frametime / self.__smallest.y)
+        return max(math.ceil(substeps), 1)
+
+    # Run the physics code on each entity for a single substep.
+    def __step(self, frametime):
+        # Update the entities that aren't manipulated by the physics engine, but have
+        # been moved or have changed movetype since the last frame, in the grid they
+        # belong in.
+        registry = self.__engine.registry
+        moved, registry.moved = registry.moved, dict()
+        for ent in moved:
+            if (ent.active and ent.grid and ent.movetype < entity.MOVETYPE_PHYSICS
+                and (ent.dirty or ent.grid != self.__get_grid(ent))):
+                self.__update(ent)
+
+        # Integrate the motion of the entities in the component store in bulk.
+        integrated = self.__integrate_batch(frametime) if self.__engine.components else ()
+
+        # Walk through each entity that is manipulated by the physics engine. Custom
+        # physics entities go first, so that they push physics entities before those
+        # move.
+        for ent in (list(registry.by_movetype(entity.MOVETYPE_CUSTOM))
+                    + list(registry.by_movetype(entity.MOVETYPE_PHYSICS))):
             # Skip if this entity is deactivated.
             if not ent.active:
-                ent = ent.next
-                continue
-
-            # Skip if this entity is not defined to be manipulated, but make sure it is
-            # actually updated in the spatial hash grid if it is marked dirty.
-            if ent.movetype < entity.MOVETYPE_PHYSICS:
-                if ent.dirty:
-                    self.__grid.update(ent)
-                ent = ent.next
                 continue
 
             # Only manipulate the velocity vector if the movetype of this entity is
-            # MOVETYPE_PHYSICS.
-            if ent.movetype == entity.MOVETYPE_PHYSICS:
+            # MOVETYPE_PHYSICS, and if it hasn't already been integrated in bulk.
+            if ent.movetype == entity.MOVETYPE_PHYSICS and ent not in integrated:
                 # Inflict gravity upon this entity.
-                ent.velocity.y -= self.__gravity.get() * self.__engine.globals.frametime
+                ent.velocity.y -= self.__gravity.get() * frametime
 
                 # Handle friction. This is done through multiplication in order to handle
                 #  +/- numbers, mathematically.
                 if ent.groundentity:
                     newspeed = max(0, abs(ent.velocity.x) - self.__friction.get() 
                                    * ent.groundentity.friction * ent.friction 
-                                   * self.__engine.globals.frametime)
+                                   * frametime)
                     if abs(ent.velocity.x) > 0:
                         newspeed /= abs(ent.velocity.x)
                     ent.velocity.x *= newspeed
@@ -268,7 +690,7 @@ class LLPhysics():
                 difference = ent.move - ent.velocity.x
                 if math.copysign(ent.move, difference) != ent.move:
                     difference = 0
-                acceleration = (ent.acceleration * self.__engine.globals.frametime * ent.move
+                acceleration = (ent.acceleration * frametime * ent.move
                                 * ent.friction)
                 if ent.groundentity:
                     acceleration *= ent.groundentity.friction
@@ -278,207 +700,211 @@ class LLPhysics():
                     acceleration = difference
                 ent.velocity.x += acceleration
 
-            # Before beginning collision detection, calculate the start and end points
-            # in order to acquire all the grid cells.
-            if ent.velocity.x >= 0 and ent.velocity.y >= 0:
-                start = ent.get_bottomleft()
-                end = ent.get_topright() + ent.velocity * self.__engine.globals.frametime
-            elif ent.velocity.x >= 0 and ent.velocity.y < 0:
-                start = ent.get_topleft()
-                end = ent.get_bottomright() + ent.velocity * self.__engine.globals.frametime
-            elif ent.velocity.x < 0 and ent.velocity.y >= 0:
-                start = ent.get_bottomright()
-                end = ent.get_topleft() + ent.velocity * self.__engine.globals.frametime
-            else:
-                start = ent.get_topright()
-                end = ent.get_bottomleft() + ent.velocity * self.__engine.globals.frametime
-            
-            # Calculate all the entities that the entity may have hit and walk through
-            # them.
-            entities = self.__grid.query_entities(start, end)
-            closest_x, x_diff = None, 0
-            closest_y, y_diff = None, 0
-            for collideent in entities:
-                # Check if the collision entity is the same as the current entity.
-                if collideent == ent:
-                    continue
-
-                # Check if collision was made by moving right.
-                if (ent.velocity.x > 0 and end.x > collideent.get_topleft().x 
-                    and start.x < collideent.get_topleft().x):
-                    # Make sure that the two entities actually horizontally collide by performing
-                    # AABB collision checks.
-                    if ent.collides_y(collideent):
-                        # Call the collision event on both entities and only continue colliding
-                        # if both calls return True.
-                        if (not ent.invoke_event("collision", collideent, COLTYPE_COLLIDING, COLDIR_LEFT)
-                            or not collideent.invoke_event("collision", ent, COLTYPE_COLLIDED, COLDIR_LEFT)):
-                            continue
-
-                        # Calculate the difference in position between the right of the entity
-                        # and the left of the collision entity.
-                        diff = abs(abs(collideent.get_topleft().x) - abs(ent.get_topright().x))
-
-                        # If the difference between the two entities are less than the previous
-                        # cached difference, or the final collided entity is not set, set the 
-                        # final collided entity to this collided entity.
-                        if not closest_x or diff < x_diff:
-                            closest_x = collideent
-                            x_diff = diff
-
-                        # If the other entity is a physics entity and this is a custom physics
-                        # entity, move it.
-                        if (ent.movetype == entity.MOVETYPE_CUSTOM 
-                            and collideent.movetype == entity.MOVETYPE_PHYSICS):
-                            collideent.set_baseorigin(collideent.get_baseorigin()
-                                + pygame.math.Vector2(ent.velocity.x * self.__engine.globals.frametime, 0))
-                
-                # Check if collision was made by moving left.
-                elif (ent.velocity.x < 0 and end.x < collideent.get_topright().x
-                      and start.x > collideent.get_topright().x):
-                    # Make sure that the two entities actually horizontally collide by performing
-                    # AABB collision checks.
-                    if ent.collides_y(collideent):
-                        # Call the collision event on both entities and only continue colliding
-                        # if both calls return True.
-                        if (not ent.invoke_event("collision", collideent, COLTYPE_COLLIDING, COLDIR_RIGHT)
-                            or not collideent.invoke_event("collision", ent, COLTYPE_COLLIDED, COLDIR_RIGHT)):
-                            continue
-
-                        # Calculate the difference in position between the left of the entity
-                        # and the right of the collision entity.
-                        diff = abs(abs(collideent.get_topright().x) - abs(ent.get_topleft().x))
-
-                        # If the difference between the two entities are less than the previous
-                        # cached difference, or the final collided entity is not set, set the 
-                        # final collided entity to this collided entity.
-                        if not closest_x or diff < x_diff:
-                            closest_x = collideent
-                            x_diff = diff
-
-                        # If the other entity is a physics entity and this is a custom physics
-                        # entity, move it.
-                        if (ent.movetype == entity.MOVETYPE_CUSTOM 
-                            and collideent.movetype == entity.MOVETYPE_PHYSICS):
-                            collideent.set_baseorigin(collideent.get_baseorigin()
-                                + pygame.math.Vector2(ent.velocity.x * self.__engine.globals.frametime, 0))
-
-                # Check if collision was made by moving upwards.
-                if (ent.velocity.y > 0 and end.y > collideent.get_bottomleft().y
-                    and start.y < collideent.get_bottomleft().y):
-                    # Make sure that the two entities actually horizontally collide by performing
-                    # AABB collision checks.
-                    if ent.collides_x(collideent):
-                        # Call the collision event on both entities and only continue colliding
-                        # if both calls return True.
-                        if (not ent.invoke_event("collision", collideent, COLTYPE_COLLIDING, COLDIR_DOWN)
-                            or not collideent.invoke_event("collision", ent, COLTYPE_COLLIDED, COLDIR_DOWN)):
-                            continue
-
-                        # Calculate the difference in position between the top of the entity
-                        # and the bottom of the collision entity.
-                        diff = abs(abs(collideent.get_bottomleft().y) - abs(ent.get_topleft().y))
-
-                        # If the difference between the two entities are less than the previous
-                        # cached difference, or the final collided entity is not set, set the 
-                        # final collided entity to this collided entity.
-                        if not closest_y or diff < y_diff:
-                            closest_y = collideent
-                            y_diff = diff
-
-                        # If the other entity is a physics entity and this is a custom physics
-                        # entity, move it.
-                        if (ent.movetype == entity.MOVETYPE_CUSTOM 
-                            and collideent.movetype == entity.MOVETYPE_PHYSICS):
-                            collideent.set_baseorigin(collideent.get_baseorigin()
-                                 + pygame.math.Vector2(0, ent.velocity.y * self.__engine.globals.frametime))
-                            collideent.groundentity = ent
-
-                # Check if collision was made by moving downwards.
-                elif (ent.velocity.y < 0 and end.y < collideent.get_topleft().y
-                      and start.y > collideent.get_topleft().y):
-                    # Make sure that the two entities actually horizontally collide by performing
-                    # AABB collision checks.
-                    if ent.collides_x(collideent):
-                        # Call the collision event on both entities and only continue colliding
-                        # if both calls return True.
-                        if (not ent.invoke_event("collision", collideent, COLTYPE_COLLIDING, COLDIR_UP)
-                            or not collideent.invoke_event("collision", ent, COLTYPE_COLLIDED, COLDIR_UP)):
-                            continue
-
-                        # Calculate the difference in position between the bottom of the entity
-                        # and the top of the collision entity.
-                        diff = abs(abs(collideent.get_topleft().y) - abs(ent.get_bottomleft().y))
-
-                        # If the difference between the two entities are less than the previous
-                        # cached difference, or the final collided entity is not set, set the 
-                        # final collided entity to this collided entity.
-                        if not closest_y or diff < y_diff:
-                            closest_y = collideent
-                            y_diff = diff
-
-                        # If the other entity is a physics entity and this is a custom physics
-                        # entity, move it.
-                        if (ent.movetype == entity.MOVETYPE_CUSTOM 
-                            and collideent.movetype == entity.MOVETYPE_PHYSICS):
-                            collideent.set_baseorigin(collideent.get_baseorigin()
-                                + pygame.math.Vector2(0, ent.velocity.y * self.__engine.globals.frametime))
-                                
-            # Basic collision resolution if this entity's being manipulated by the physics engine.
-            origin = ent.get_baseorigin()
+            # Gather everything that the entity may hit while moving this frame, within
+            # the box swept by the entity.
+            candidates = self.__get_candidates(ent, ent.velocity * frametime)
+
+            # Physics entities slide along whatever they hit, while custom physics
+            # entities push physics entities along with them.
             ent.groundentity = None
             if ent.movetype == entity.MOVETYPE_PHYSICS:
-                # Handle horizontal collision.
-                if closest_x:
-                    # Call the collisionfinal event on both entities.
-                    coldir = COLDIR_LEFT if ent.velocity.x > 0 else COLDIR_RIGHT
-                    ent.invoke_event("collisionfinal", closest_x, COLTYPE_COLLIDING, coldir)
-                    closest_x.invoke_event("collisionfinal", ent, COLTYPE_COLLIDED, coldir)
-
-                    # Resolve this entity's velocity and origin.
-                    if coldir == COLDIR_LEFT:
-                        origin.x = closest_x.get_topleft().x - ent.get_hitbox().x
-                    else:
-                        origin.x = closest_x.get_topright().x
-                    ent.velocity.x = 0
-
-                # Handle vertical collision.
-                if closest_y:
-                    # Call the collisionfinal event on both entities.
-                    coldir = COLDIR_DOWN if ent.velocity.y > 0 else COLDIR_UP
-                    ent.invoke_event("collisionfinal", closest_y, COLTYPE_COLLIDING, coldir)
-                    closest_y.invoke_event("collisionfinal", ent, COLTYPE_COLLIDED, coldir)
-
-                    # Resolve this entity's velocity and origin.
-                    if coldir == COLDIR_DOWN:
-                        origin.y = closest_y.get_bottomleft().y
-                    else:
-                        origin.y = closest_y.get_topleft().y + ent.get_hitbox().y
-                        ent.groundentity = closest_y
-                    ent.velocity.y = 0
+                self.__slide(ent, candidates, frametime)
+            else:
+                self.__push(ent, candidates, frametime)
 
-            # Set the new origin of this entity and update it in the grid.
-            ent.set_baseorigin(origin + ent.velocity * self.__engine.globals.frametime)
-            if ent.dirty:
-                self.__grid.update(ent)
+            # Update this entity in the grid.
+            if ent.dirty or ent.grid != self.__get_grid(ent):
+                self.__update(ent)
 
             # Kill this entity if it falls below minheight:
             if ent.get_baseorigin().y < self.__minheight.get():
-                oldent, ent = ent, ent.next
-                self.__engine.delete_entity(oldent)
+                self.__engine.delete_entity(ent)
+
+    # Get the box of an entity, as a tuple of its left, bottom, right and top sides.
+    def __get_box(self, ent):
+        origin, hitbox = ent.get_baseorigin(), ent.get_hitbox()
+        return (origin.x, origin.y - hitbox.y, origin.x + hitbox.x, origin.y)
+
+    # Gather everything that an entity may hit when moved by a displacement. Returns
+    # a list of tuples of each entity, its box, and its tile flags if it is a tile in
+    # the tilemap, or None otherwise.
+    def __get_candidates(self, ent, displacement):
+        # Calculate the box swept by the entity.
+        left, bottom, right, top = self.__get_box(ent)
+        start = pygame.math.Vector2(min(left, left + displacement.x), max(top, top + displacement.y))
+        end = pygame.math.Vector2(max(right, right + displacement.x),
+                                  min(bottom, bottom + displacement.y))
+
+        # Walk through the entities in the grids, and the tiles in the tilemap if
+        # this is a physics entity.
+        candidates = [(other, self.__get_box(other), None)
+                      for other in self.__query_grids(start, end) if other != ent]
+        if self.__tilemap and ent.movetype == entity.MOVETYPE_PHYSICS:
+            size = tilemap.TILE_SIZE
+            for cell, flags in self.__tilemap.iter_cells(start, end):
+                box = (cell[0] * size, cell[1] * size, (cell[0] + 1) * size, (cell[1] + 1) * size)
+                candidates.append((self.__tilemap.tiles[cell], box, flags))
+        return candidates
+
+    # Find the earliest hit of a box moved by a displacement among the candidates,
+    # skipping any that are ignored. One-way tiles are only hit from above, by boxes
+    # that aren't already inside them. Returns the time of impact, whether the hit
+    # is horizontal, and the candidate, or None if nothing is hit.
+    def __find_hit(self, box, dx, dy, candidates, ignored):
+        hit = None
+        for candidate in candidates:
+            if candidate[0] in ignored:
+                continue
+            result = sweep(box, candidate[1], dx, dy)
+            if not result or (hit and result[0] >= hit[0]):
+                continue
+            flags = candidate[2]
+            if (flags != None and not flags & tilemap.TILE_SOLID
+                and (result[1] or dy >= 0 or box[1] < candidate[1][3])):
+                continue
+            hit = (*result, candidate)
+        return hit
+
+    # Get the collision direction of a hit, based on the direction of movement.
+    def __get_coldir(self, horizontal, dx, dy):
+        if horizontal:
+            return COLDIR_LEFT if dx > 0 else COLDIR_RIGHT
+        return COLDIR_DOWN if dy > 0 else COLDIR_UP
+
+    # Move a physics entity through its velocity, using swept AABB collision. The
+    # entity is moved up to the earliest hit, the velocity into the hit side is
+    # removed, and the rest of the movement slides along it, for a few iterations.
+    def __slide(self, ent, candidates, frametime):
+        origin, hitbox = ent.get_baseorigin(), ent.get_hitbox()
+        x, y, width, height = origin.x, origin.y, hitbox.x, hitbox.y
+        ignored = set()
+        remaining = 1.0
+        for i in range(SLIDE_ITERATIONS):
+            dx = ent.velocity.x * frametime * remaining
+            dy = ent.velocity.y * frametime * remaining
+            if dx == 0 and dy == 0:
+                break
+            box = (x, y - height, x + width, y)
+
+            # Find the earliest hit whose collision events on both entities return
+            # True. Anything that doesn't is ignored for the rest of this frame.
+            while True:
+                hit = self.__find_hit(box, dx, dy, candidates, ignored)
+                if not hit:
+                    break
+                toi, horizontal, (collider, otherbox, flags) = hit
+                coldir = self.__get_coldir(horizontal, dx, dy)
+
+                # Colliders report the merged tile nearest to the centre of this
+                # entity at the point of impact.
+                other = self.__get_member(collider, x + dx * toi + width / 2, y + dy * toi - height / 2)
+                if (ent.invoke_event("collision", other, COLTYPE_COLLIDING, coldir)
+                    and (flags != None
+                         or other.invoke_event("collision", ent, COLTYPE_COLLIDED, coldir))):
+                    break
+                ignored.add(collider)
+
+            # Move freely if nothing was hit.
+            if not hit:
+                x += dx
+                y += dy
+                break
+
+            # Move up to the point of impact, lining up with the side that was hit.
+            if horizontal:
+                x = otherbox[0] - width if dx > 0 else otherbox[2]
+                y += dy * toi
+            else:
+                x += dx * toi
+                y = otherbox[1] if dy > 0 else otherbox[3] + height
+
+            # Call the collisionfinal event on both entities. The flags of tiles in
+            # the tilemap stand in for their own events.
+            ent.invoke_event("collisionfinal", other, COLTYPE_COLLIDING, coldir)
+            if flags == None or flags & tilemap.TILE_SPIKED:
+                other.invoke_event("collisionfinal", ent, COLTYPE_COLLIDED, coldir)
+
+            # Remove the velocity into the side that was hit, and slide along it for
+            # the rest of the frame.
+            if horizontal:
+                ent.velocity.x = 0
+            else:
+                if coldir == COLDIR_UP:
+                    ent.groundentity = other
+                ent.velocity.y = 0
+            remaining *= 1 - toi
+
+        # Set the new origin of this entity.
+        ent.set_baseorigin(pygame.math.Vector2(x, y))
+
+    # Move a custom physics entity through its velocity, invoking the collision
+    # events of everything it hits on the way, and pushing physics entities along.
+    def __push(self, ent, candidates, frametime):
+        box = self.__get_box(ent)
+        displacement = ent.velocity * frametime
+        for other, otherbox, flags in candidates:
+            hit = sweep(box, otherbox, displacement.x, displacement.y)
+            if not hit:
                 continue
 
-            # Get the next entity.
-            ent = ent.next
+            # Call the collision event on both entities and only continue colliding
+            # if both calls return True. Colliders report the merged tile nearest to
+            # the centre of this entity at the point of impact.
+            toi, horizontal = hit
+            coldir = self.__get_coldir(horizontal, displacement.x, displacement.y)
+            other = self.__get_member(other, (box[0] + box[2]) / 2 + displacement.x * toi,
+                                      (box[1] + box[3]) / 2 + displacement.y * toi)
+            if (not ent.invoke_event("collision", other, COLTYPE_COLLIDING, coldir)
+                or not other.invoke_event("collision", ent, COLTYPE_COLLIDED, coldir)):
+                continue
 
-    # Remove all entities from the spatial hash grid.
+            # If the other entity is a physics entity, move it.
+            if other.movetype == entity.MOVETYPE_PHYSICS:
+                if horizontal:
+                    other.set_baseorigin(other.get_baseorigin() + pygame.math.Vector2(displacement.x, 0))
+                else:
+                    other.set_baseorigin(other.get_baseorigin() + pygame.math.Vector2(0, displacement.y))
+                    if coldir == COLDIR_DOWN:
+                        other.groundentity = ent
+
+        # Set the new origin of this entity.
+        ent.set_baseorigin(ent.get_baseorigin() + displacement)
+
+    # Return the entities in the static and dynamic grids that can collide, within
+    # the grid cells found within the given rectangle.
+    def __query_grids(self, start, end):
+        return (self.__static.query_entities(start, end, False)
+                + self.__dynamic.query_entities(start, end, False))
+
+    # Remove all entities from the spatial hash grids and the tilemap, and restore
+    # the default cell size.
     def clear_entities(self):
-        self.__grid.reset()
+        self.__static.reset()
+        self.__dynamic.reset()
+        self.set_cell_size(CELL_SIZE)
+        self.__smallest = pygame.math.Vector2(math.inf, math.inf)
+        if self.__tilemap:
+            self.__tilemap.reset()
+        self.__colliders = dict()
+        self.__merged = dict()
 
     # For a given set of start/end points forming a rectangle, return all the 
     # entities within the grid cells that are found within said rectangle.
     def query_entities(self, start, end, include_nocollide = True):
-        return self.__grid.query_entities(start, end, include_nocollide)
+        return list(self.iter_entities(start, end, include_nocollide))
+
+    # For a given set of start/end points forming a rectangle, iterate over all the
+    # entities within the grid cells that are found within said rectangle. Colliders
+    # are replaced by their merged tiles within the rectangle.
+    def iter_entities(self, start, end, include_nocollide = True):
+        for ent in self.__static.iter_entities(start, end, include_nocollide):
+            if ent in self.__colliders:
+                yield from self.__iter_members(ent, start, end)
+            else:
+                yield ent
+        yield from self.__dynamic.iter_entities(start, end, include_nocollide)
+        if self.__tilemap:
+            yield from self.__tilemap.iter_entities(start, end)
     
 # Define what should be imported from this module.
 __all__ = ["LLPhysics", "COLTYPE_COLLIDING", "COLTYPE_COLLIDED", 
@@ -3,14 +3,16 @@
 import pygame
 
 from . import entity
+from ..event import Event
 
 # Rectangle entity.
 class Rectangle(entity.Entity):
+    __slots__ = ("colour",)
+
     # Construct a new rectangle.
     def __init__(self, engine, classname):
         # Call the entity constructor and modify its default properties.
         super().__init__(engine, classname)
-        self.get_event("draw").set_func(draw_rectangle)
         self.movetype = entity.MOVETYPE_ANCHORED
 
         # Rectangle properties.
@@ -18,4 +20,7 @@ class Rectangle(entity.Entity):
 
 # Draw this rectangle.
 def draw_rectangle(self, screen):
-    pygame.draw.rect(screen, self.colour, self._rect)
\ No newline at end of file
+    pygame.draw.rect(screen, self.colour, self._rect)
+
+# Rectangles share the same draw event.
+Rectangle.set_default_event(Event("draw", draw_rectangle))
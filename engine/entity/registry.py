@@ -0,0 +1,179 @@
+"""The entity registry, which stores every entity in the engine densely,
+alongside index sets for looking entities up by id, class name or movetype
+without walking every entity.
+
+The dense list is unordered, as entities are removed from it by swapping the
+last entity into their place. Anything that needs creation order, such as
+drawing, should walk the engine's entity linked list instead."""
+
+# Number of bits of an entity id used for its handle index. The remaining bits
+# hold the generation of the handle.
+HANDLE_BITS = 24
+HANDLE_MASK = (1 << HANDLE_BITS) - 1
+
+# The entity registry class.
+class EntityRegistry():
+    # Construct a new entity registry.
+    def __init__(self):
+        # Every entity, in no particular order. Each entity keeps its index in
+        # this list, so that it can be removed by swapping the last entity into
+        # its place.
+        self.entities = []
+
+        # Generational handles. An entity id packs the handle index and its
+        # generation, so that ids of deleted entities are never resolved to
+        # whichever entity reuses their handle.
+        self.__handles = []
+        self.__generations = []
+        self.__free = []
+
+        # Index sets, keyed by class name and movetype. These are dictionaries with
+        # no values, so that they keep the order that entities were added in.
+        self.__classes = dict()
+        self.__movetypes = dict()
+
+        # The number of active entities.
+        self.__active = 0
+
+        # The number of entities ever added, used for numbering entities in the
+        # order that they were created.
+        self.__created = 0
+
+        # Entities that have to be ticked each frame. These are kept in creation
+        # order, which is restored before ticking if an older entity subscribes
+        # after a newer one.
+        self.ticking = dict()
+        self.__ticking_sorted = True
+
+        # Entities whose origin, hitbox or movetype has changed since the physics
+        # engine last updated them in its grids.
+        self.moved = dict()
+
+    # Add an entity to this registry and assign it an id. If a component store is
+    # given, the motion of the entity is moved into it.
+    def add(self, ent, components = None):
+        # Reuse a free handle if there is one, otherwise create a new one.
+        if self.__free:
+            index = self.__free.pop()
+            self.__handles[index] = ent
+        else:
+            index = len(self.__handles)
+            self.__handles.append(ent)
+            self.__generations.append(0)
+        ent.entid = (self.__generations[index] << HANDLE_BITS) | index
+        ent._registry = self
+        if components != None:
+            components.add(ent)
+
+        # Store the entity and index it.
+        ent._index = len(self.entities)
+        ent._serial = self.__created
+        self.__created += 1
+        self.entities.append(ent)
+        self.__classes.setdefault(ent.get_class(), dict())[ent] = None
+        self.__movetypes.setdefault(ent.movetype, dict())[ent] = None
+        self.moved[ent] = None
+        if ent.active:
+            self.__active += 1
+        if ent.ticks():
+            self.ticking[ent] = None
+        return ent.entid
+
+    # Remove an entity from this registry, invalidating its id.
+    def remove(self, ent):
+        # Ignore entities that aren't in this registry.
+        if ent._registry != self:
+            return
+
+        # Release the handle and bump its generation.
+        index = ent.entid & HANDLE_MASK
+        self.__handles[index] = None
+        self.__generations[index] += 1
+        self.__free.append(index)
+
+        # Remove the entity from the dense list, moving the last entity into its
+        # place, and remove it from the index sets.
+        last = self.entities.pop()
+        if last != ent:
+            self.entities[ent._index] = last
+            last._index = ent._index
+        ent._index = None
+        self.__classes[ent.get_class()].pop(ent, None)
+        self.__movetypes[ent.movetype].pop(ent, None)
+        self.moved.pop(ent, None)
+        if ent.active:
+            self.__active -= 1
+        self.ticking.pop(ent, None)
+        if ent._components != None:
+            ent._components.remove(ent)
+        ent._registry = None
+
+    # Remove every entity from this registry, invalidating all of their ids.
+    def clear(self):
+        for ent in self.entities:
+            if ent._components != None:
+                ent._components.remove(ent)
+            ent._registry = None
+            ent._index = None
+        for index, ent in enumerate(self.__handles):
+            if ent:
+                self.__handles[index] = None
+                self.__generations[index] += 1
+                self.__free.append(index)
+        self.entities = []
+        self.__classes.clear()
+        self.__movetypes.clear()
+        self.__active = 0
+        self.ticking = dict()
+        self.__ticking_sorted = True
+        self.moved = dict()
+
+    # Retrieve an entity by its id, or None if it no longer exists.
+    def get(self, entid):
+        index = entid & HANDLE_MASK
+        if (index >= len(self.__handles)
+            or self.__generations[index] != entid >> HANDLE_BITS):
+            return None
+        return self.__handles[index]
+
+    # Retrieve the set of entities with a given class name.
+    def by_class(self, classname):
+        return self.__classes.get(classname, dict()).keys()
+
+    # Retrieve the set of entities with a given movetype.
+    def by_movetype(self, movetype):
+        return self.__movetypes.get(movetype, dict()).keys()
+
+    # Get the number of entities, or only the active ones.
+    def count(self, active = True):
+        return self.__active if active else len(self.entities)
+
+    # Re-index an entity after its movetype changed, and mark it for the physics
+    # engine to move it to the grid it now belongs in.
+    def movetype_changed(self, ent, old):
+        self.__movetypes[old].pop(ent, None)
+        self.__movetypes.setdefault(ent.movetype, dict())[ent] = None
+        self.moved[ent] = None
+
+    # Subscribe or unsubscribe an entity from ticking after its per-frame event changed.
+    def tick_changed(self, ent):
+        if not ent.ticks():
+            self.ticking.pop(ent, None)
+        elif ent not in self.ticking:
+            if self.ticking and next(reversed(self.ticking))._serial > ent._serial:
+                self.__ticking_sorted = False
+            self.ticking[ent] = None
+
+    # Get a list of the entities that have to be ticked, in creation order.
+    def get_ticking(self):
+        if not self.__ticking_sorted:
+            self.ticking = dict.fromkeys(sorted(self.ticking, key=lambda ent: ent._serial))
+            self.__ticking_sorted = True
+        return list(self.ticking)
+
+    # Count an entity that has just been activated.
+    def activated(self, ent):
+        self.__active += 1
+
+# Define what should be imported from this module.
+__all__ = ["EntityRegistry"]
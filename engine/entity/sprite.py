@@ -9,6 +9,7 @@ import os
 import pygame
 
 from . import entity
+from ..event import Event
 
 # Macros.
 SPRITES_PER_ROW = 16
@@ -18,11 +19,12 @@ cached_tiles = dict()
 
 # Sprite entity.
 class Sprite(entity.Entity):
+    __slots__ = ("__tiles", "__texture", "__flip_x", "__flip_y", "index", "__oldindex")
+
     # Construct a new sprite.
     def __init__(self, engine, classname):
         # Call the entity constructor and modify its default properties.
         super().__init__(engine, classname)
-        self.get_event("draw").set_func(Sprite.draw_sprite)
         self.movetype = entity.MOVETYPE_PHYSICS
 
         # Texture information.
@@ -99,4 +101,7 @@ class Sprite(entity.Entity):
 
     # Return how many tile entries are present for the loaded tileset.
     def get_tileset_count(self):
-        return len(self.__tiles)
\ No newline at end of file
+        return len(self.__tiles)
+
+# Sprites share the same draw event.
+Sprite.set_default_event(Event("draw", Sprite.draw_sprite))
@@ -7,6 +7,7 @@ import os
 import pygame
 
 from . import entity
+from ..event import Event
 
 # Macros.
 TILES_PER_ROW = 16
@@ -16,16 +17,18 @@ cached_sheets = dict()
 
 # Map tile entity.
 class Tile(entity.Entity):
+    __slots__ = ("__texture", "tileflags")
+
     # Construct a new map tile.
     def __init__(self, engine, classname):
         # Call the entity constructor and modify its default properties.
         super().__init__(engine, classname)
-        self.get_event("draw").set_func(Tile.draw_tile)
         self.movetype = entity.MOVETYPE_ANCHORED
 
         # Map tile properties.
         self.__texture = engine.missing # Default to the missing texture (although
                                         # it won't be stretched).
+        self.tileflags = 0              # The TILE_* flags of this tile, for the tilemap.
 
     # Load from a tile sheet.
     def load(self, path, res, index):
@@ -73,4 +76,7 @@ class Tile(entity.Entity):
 
     # Draw this map tile entity.
     def draw_tile(self, screen):
-        screen.blit(self.__texture, self._rect)
\ No newline at end of file
+        screen.blit(self.__texture, self._rect)
+
+# Tiles share the same draw event.
+Tile.set_default_event(Event("draw", Tile.draw_tile))
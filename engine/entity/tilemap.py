@@ -0,0 +1,167 @@
+"""The tilemap, an occupancy grid of the map tiles that only need simple collision
+handling. Physics entities collide with the tiles in it through index math on a
+NumPy array of per-cell flags, instead of going through the spatial hash grids.
+
+The tile entities themselves are still kept, so that they can be drawn and used
+as the ground entity of whatever stands on them. Tiles that need collision
+callbacks beyond what the flags describe should stay out of the tilemap.
+
+The tilemap is optional and requires NumPy."""
+
+import pygame
+from . import entity
+from .tile import Tile
+
+# NumPy is an optional dependency, only required for the tilemap.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Named constants defining default tilemap properties.
+TILE_SIZE = 32
+DEFAULT_SIZE = (64, 32)
+
+# Flags for defining how a tile collides.
+TILE_SOLID = 1      # This tile blocks entities from every direction.
+TILE_ONEWAY = 2     # This tile only blocks entities landing on it from above.
+TILE_ICE = 4        # This tile is slippery. Its friction is kept by the tile entity.
+TILE_SPIKED = 8     # This tile's collisionfinal event is invoked when it is hit.
+
+# Tilemap class.
+class TileMap():
+    # Construct a new, empty tilemap.
+    def __init__(self, size = TILE_SIZE):
+        # The flags of each cell, indexed by column and row relative to the cell
+        # at the offset. Rows go upwards, like base origins do.
+        self.flags = numpy.zeros((0, 0), dtype=numpy.uint8)
+        self.__offset = (0, 0)
+
+        # The tile entity occupying each cell, keyed by its column and row.
+        self.tiles = dict()
+
+        # Store the size of each cell.
+        self.__size = size
+
+    # Check if an entity can be held by this tilemap. It must be an anchored tile
+    # with collision flags set, which exactly covers a free cell.
+    def accepts(self, ent):
+        if not isinstance(ent, Tile) or not ent.tileflags or ent.movetype != entity.MOVETYPE_ANCHORED:
+            return False
+        origin, hitbox = ent.get_baseorigin(), ent.get_hitbox()
+        if (hitbox.x != self.__size or hitbox.y != self.__size
+            or origin.x % self.__size or origin.y % self.__size):
+            return False
+        return self.tiles.get(self.__get_cell(ent), ent) == ent
+
+    # Insert a tile into this tilemap.
+    def insert(self, ent):
+        cell = self.__get_cell(ent)
+        self.__fit(cell)
+        self.flags[cell[0] - self.__offset[0], cell[1] - self.__offset[1]] = ent.tileflags
+        self.tiles[cell] = ent
+
+        # Use the same bookkeeping as the spatial hash grids, so that the tile can
+        # be removed through its grid attribute.
+        ent.grid = self
+        ent.gridrange = (*cell, *cell)
+        ent.dirty = False
+
+    # Remove a tile from this tilemap.
+    def remove(self, ent):
+        # Ignore entities that aren't in this tilemap.
+        if ent.grid != self:
+            return
+
+        # Clear the cell of the tile.
+        cell = ent.gridrange[:2]
+        self.flags[cell[0] - self.__offset[0], cell[1] - self.__offset[1]] = 0
+        del self.tiles[cell]
+        ent.grid = None
+        ent.gridrange = None
+
+    # Update a tile, moving it to the cell it now covers.
+    def update(self, ent):
+        if ent.grid != self or ent.gridrange[:2] != self.__get_cell(ent):
+            self.remove(ent)
+            self.insert(ent)
+        ent.dirty = False
+
+    # Reset this tilemap, thus removing all tiles from it.
+    def reset(self):
+        for ent in self.tiles.values():
+            ent.grid = None
+            ent.gridrange = None
+        self.flags = numpy.zeros((0, 0), dtype=numpy.uint8)
+        self.__offset = (0, 0)
+        self.tiles = dict()
+
+    # Get the flags of a cell.
+    def get_flags(self, cell):
+        x, y = cell[0] - self.__offset[0], cell[1] - self.__offset[1]
+        width, height = self.flags.shape
+        if 0 <= x < width and 0 <= y < height:
+            return self.flags.item(x, y)
+        return 0
+
+    # For a given set of start/end points forming a rectangle, iterate over the keys
+    # and flags of the occupied cells that are found within said rectangle.
+    def iter_cells(self, start, end):
+        # Take the block of the flags array that the rectangle covers.
+        x0, x1 = sorted((int(start.x // self.__size), int(end.x // self.__size)))
+        y0, y1 = sorted((int(start.y // self.__size), int(end.y // self.__size)))
+        x0, y0 = max(x0 - self.__offset[0], 0), max(y0 - self.__offset[1], 0)
+        x1, y1 = x1 - self.__offset[0] + 1, y1 - self.__offset[1] + 1
+        block = self.flags[x0:max(x1, x0), y0:max(y1, y0)]
+
+        # Yield each cell in the block that has any flags set.
+        for x, y in zip(*numpy.nonzero(block)):
+            yield (int(x) + x0 + self.__offset[0], int(y) + y0 + self.__offset[1]), block.item(x, y)
+
+    # For a given set of start/end points forming a rectangle, iterate over all the
+    # tiles within the cells that are found within said rectangle.
+    def iter_entities(self, start, end):
+        for cell, flags in self.iter_cells(start, end):
+            yield self.tiles[cell]
+
+    # Iterate over the keys of the cells that a tile is in.
+    def get_cells(self, ent):
+        if ent.gridrange:
+            yield ent.gridrange[:2]
+
+    # Get the area of a cell, as a rect in window co-ordinates.
+    def get_cell_rect(self, cell):
+        return pygame.Rect(cell[0] * self.__size, -(cell[1] + 1) * self.__size,
+                           self.__size, self.__size)
+
+    # Get the key of the cell that a tile covers, which is the cell of its
+    # bottom-left corner.
+    def __get_cell(self, ent):
+        origin = ent.get_baseorigin()
+        return (int(origin.x // self.__size), int((origin.y - self.__size) // self.__size))
+
+    # Grow the flags array so that it includes a given cell. The array at least
+    # doubles in size along each axis that it grows on.
+    def __fit(self, cell):
+        # Start the array at the first cell that is inserted.
+        if not self.flags.size:
+            self.flags = numpy.zeros(DEFAULT_SIZE, dtype=numpy.uint8)
+            self.__offset = cell
+            return
+
+        # Check if the cell is already within the array.
+        x, y = cell[0] - self.__offset[0], cell[1] - self.__offset[1]
+        width, height = self.flags.shape
+        if 0 <= x < width and 0 <= y < height:
+            return
+
+        # Pad the array on the sides that the cell is beyond.
+        left = max(-x, width) if x < 0 else 0
+        right = max(x + 1 - width, width) if x >= width else 0
+        bottom = max(-y, height) if y < 0 else 0
+        top = max(y + 1 - height, height) if y >= height else 0
+        self.flags = numpy.pad(self.flags, ((left, right), (bottom, top)))
+        self.__offset = (self.__offset[0] - left, self.__offset[1] - bottom)
+
+# Define what should be imported from this module.
+__all__ = ["TileMap", "TILE_SOLID", "TILE_ONEWAY", "TILE_ICE", "TILE_SPIKED"]
@@ -18,14 +18,33 @@ class Event():
         self.__func = func
         self.__pre = []       # Pre-call detours.
         self.__post = []      # Post-call detours.
+        self.listener = None  # Called with this event whenever its function or detours change.
+        self.__compile()      # Sets self.invoke, which invokes this event: invoke(owner, ...)
 
     # Get the name of this event.
     def get_name(self):
         return self.__name
     
+    # Create a copy of this event, with its own list of detours.
+    def copy(self):
+        event = Event(self.__name, self.__func)
+        event.__pre = list(self.__pre)
+        event.__post = list(self.__post)
+        event.__compile()
+        return event
+
+    # Get the function to be invoked.
+    def get_func(self):
+        return self.__func
+
     # Replace the current function to be invoked with a new one.
     def set_func(self, func):
         self.__func = func
+        self.__changed()
+
+    # Check if this event has been detoured.
+    def has_hooks(self):
+        return bool(self.__pre or self.__post)
     
     # Detour this event with a new function.
     def hook(self, function, post = False):
@@ -37,6 +56,7 @@ class Event():
             if function in self.__pre:
                 return
             self.__pre.append(function)
+        self.__changed()
 
     # Remove a detoured function from this event.
     def remove_hook(self, function, post = False):
@@ -44,36 +64,54 @@ class Event():
             self.__post.remove(function)
         elif function in self.__pre:
             self.__pre.remove(function)
+        self.__changed()
+
+    # Recompile this event and notify the listener that it has changed.
+    def __changed(self):
+        self.__compile()
+        if self.listener:
+            self.listener(self)
+
+    # Rebuild the callable that invokes this event, which is stored as the invoke
+    # attribute. Without any detours, invoking the event is a single call to its
+    # function, otherwise it is a chain with the current detours bound to it.
+    def __compile(self):
+        if not self.__pre and not self.__post:
+            self.invoke = self.__func
+            return
+        name, func = self.__name, self.__func
+        pres, posts = tuple(self.__pre), tuple(self.__post)
 
-    # Invoke this event.
-    def invoke(self, *args):
-        # Configure the return value at the start.
-        returnValue = None
-        overrided = False
+        # Invoke this event.
+        def invoke(owner, *args):
+            # Configure the return value at the start.
+            returnValue = None
+            overrided = False
 
-        # Call any pre-call detours.
-        for pre in self.__pre:
-            result = pre(args[0], self.__name, returnValue, *args[1:])
-            if result != Event.DETOUR_CONTINUE:
-                if result[0] == Event.DETOUR_SUPERSEDE:
-                    return result[1]
-                elif result[0] == Event.DETOUR_OVERRIDE:
-                    returnValue = result[1]
-                    overrided = True
+            # Call any pre-call detours.
+            for pre in pres:
+                result = pre(owner, name, returnValue, *args)
+                if result != Event.DETOUR_CONTINUE:
+                    if result[0] == Event.DETOUR_SUPERSEDE:
+                        return result[1]
+                    elif result[0] == Event.DETOUR_OVERRIDE:
+                        returnValue = result[1]
+                        overrided = True
 
-        # Call the original function.
-        expectedReturn = self.__func(*args)
-        if not overrided:
-            returnValue = expectedReturn
-        
-        # Call any post-call detours.
-        for post in self.__post:
-            result = post(args[0], self.__name, returnValue, *args[1:])
-            if result != Event.DETOUR_CONTINUE:
-                if result[0] == Event.DETOUR_SUPERSEDE:
-                    return result[1]
-                elif result[0] == Event.DETOUR_OVERRIDE:
-                    returnValue = result[1]
-        
-        # Return the return value.
-        return returnValue
\ No newline at end of file
+            # Call the original function.
+            expectedReturn = func(owner, *args)
+            if not overrided:
+                returnValue = expectedReturn
+            
+            # Call any post-call detours.
+            for post in posts:
+                result = post(owner, name, returnValue, *args)
+                if result != Event.DETOUR_CONTINUE:
+                    if result[0] == Event.DETOUR_SUPERSEDE:
+                        return result[1]
+                    elif result[0] == Event.DETOUR_OVERRIDE:
+                        returnValue = result[1]
+            
+            # Return the return value.
+            return returnValue
+        self.invoke = invoke
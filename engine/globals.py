@@ -7,4 +7,11 @@ class GlobalVars():
         self.fps = 0        # The average FPS of the game. Calculations vary depending
                             # on which method of frame-limitation is used.
         self.frames = 0     # Number of frames ever since the engine launched.
-        self.time = 0       # Time ever since the engine launched (s).
\ No newline at end of file
+        self.time = 0       # Time ever since the engine launched (s).
+        self.pacing_error = 0   # How late the previous frame ended relative to its deadline (s),
+                                # when using the hybrid frame pacer.
+        self.substeps = 0       # Number of physics substeps taken in the previous frame.
+        self.skipped_time = 0   # Frame time that physics skipped in the previous frame, beyond
+                                # the substep cap (s).
+        self.skipped_total = 0  # Frame time that physics has skipped ever since the engine
+                                # launched (s).
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""An adaptive quality governor, which watches how long each frame takes
+against the frame budget set by fps_max, and steps optional work down when
+the budget is repeatedly blown (and back up when there is headroom)."""
+
+# Quality levels. Optional work is only done while the quality gvar is at or
+# above the level for said work.
+QUALITY_MIN         = 0 # Bare minimum: render every other frame.
+QUALITY_FULLRATE    = 1 # Render every frame.
+QUALITY_DEBRIS      = 2 # Spawn cosmetic debris entities.
+QUALITY_PARALLAX    = 3 # Scroll backgrounds with parallax.
+QUALITY_MAX         = 3
+
+# Named constants defining default governor properties.
+STEPDOWN_FRAMES     = 30    # Frames over budget before stepping down.
+STEPUP_FRAMES       = 300   # Frames with headroom before stepping up.
+HEADROOM            = 0.6   # Fraction of the budget a frame must fit in to count as headroom.
+
+# Adaptive quality governor.
+class QualityGovernor():
+    # Construct a new quality governor.
+    def __init__(self, engine):
+        # Compose this governor with the engine instance.
+        self.__engine = engine
+
+        # Create the gvars for the governor.
+        self.enabled = engine.create_gvar("use_quality_governor", 0,
+                                          "Lower the quality when frames go over budget.")
+        self.quality = engine.create_gvar("quality", QUALITY_MAX,
+                                          "Quality level of optional work.",
+                                          min = QUALITY_MIN, max = QUALITY_MAX)
+
+        # Counters for how many frames were over budget or had headroom.
+        self.__over = 0
+        self.__under = 0
+
+    # Feed the governor the time spent working on the previous frame (s),
+    # excluding any time spent waiting for the frame limiter.
+    def update(self, worktime):
+        # Only govern the quality if enabled and if we actually have a budget.
+        fps_max = self.__engine.fps_max.get()
+        if not self.enabled.get() or fps_max <= 0:
+            return
+        budget = 1 / fps_max
+
+        # Count the frames that went over budget and that had headroom.
+        if worktime > budget:
+            self.__over += 1
+            self.__under = 0
+        elif worktime < budget * HEADROOM:
+            self.__over = max(self.__over - 1, 0)
+            self.__under += 1
+        else:
+            self.__under = 0
+
+        # Step the quality down or up if the budget is consistently blown
+        # or there is consistently headroom.
+        if self.__over >= STEPDOWN_FRAMES:
+            self.__step(-1, worktime, budget)
+        elif self.__under >= STEPUP_FRAMES:
+            self.__step(1, worktime, budget)
+
+    # Step the quality level in the given direction and log the transition.
+    def __step(self, direction, worktime, budget):
+        # Reset the counters, so that the new level gets a fair chance.
+        self.__over = 0
+        self.__under = 0
+
+        # Change the quality level, if it isn't already at its limit.
+        old = self.quality.get()
+        new = self.quality.set(old + direction)
+        if new != old:
+            self.__engine.console.log(f"Quality governor: {old} -> {new} "
+                                      f"(frame {worktime * 1000:.1f}ms, budget {budget * 1000:.1f}ms)")
+
+# Define what should be imported from this module.
+__all__ = ["QualityGovernor", "QUALITY_MIN", "QUALITY_FULLRATE", "QUALITY_DEBRIS",
+           "QUALITY_PARALLAX", "QUALITY_MAX"]
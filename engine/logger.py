@@ -18,11 +18,15 @@ class LoggerException(Exception):
 
 # A new logger instance will write to a named text document
 # for each instance of this process in a logging folder, located
-# in the current working directory.
+# in the current working directory by default.
 class Logger():
     # Cache the date and time of this session.
     datetime = ""
 
+    # The folder that logfiles are written into. Set this before creating any
+    # logger to write the logs somewhere else.
+    directory = "logging"
+
     # Construct a new logger instance, with a specified name.
     def __init__(self, name, use_console = True):
         # Set the details of this logger.
@@ -31,19 +35,18 @@ class Logger():
         self.__buffer = [f"{__main__.__file__}:\n\n"]
         self.__closed = False
 
-        # If it doesn't already exist, create a new folder in the
-        # current working directory for logfiles.
-        if not os.path.isdir("logging"):
-            os.mkdir("logging")
+        # If it doesn't already exist, create a new folder for logfiles.
+        if not os.path.isdir(Logger.directory):
+            os.mkdir(Logger.directory)
 
         # Create a new directory for this session, if not done so.
         if Logger.datetime == "":
             now = datetime.datetime.now()
             Logger.datetime = now.strftime("%Y-%m-%d %H-%M-%S") # YYYY-MM-DD hh-mm-ss
-            os.mkdir(f"logging/{Logger.datetime}")
+            os.mkdir(f"{Logger.directory}/{Logger.datetime}")
 
         # Check if a logfile under this name already exists.
-        filename = f"logging/{Logger.datetime}/{self.__name}.txt"
+        filename = f"{Logger.directory}/{Logger.datetime}/{self.__name}.txt"
         if os.path.isfile(filename):
             raise FileExistsError(f"Logfile with name {self.__name} already exists!")
 
@@ -16,6 +16,8 @@ from . import game_interface
 from . import entity
 from . import ui
 from . import sound
+from . import pacer
+from . import governor
 
 # Engine-oriented timer, only invoked per frame.
 class Timer():
@@ -34,6 +36,7 @@ class LLEngine():
         # Initialize Pygame and set up any crucial Pygame objects here.
         pygame.init()
         self.__clock = pygame.time.Clock()
+        self.__pacer = pacer.FramePacer()
         self.missing = None # Cached missing texture; must be set after the video mode is set!
         self.origin = pygame.Vector2(0, 0) # Used for the background.
 
@@ -53,8 +56,16 @@ class LLEngine():
                                         "Frame rate limiter. Set to 0 for unlimited FPS.")
         self.use_self_busywait = self.create_gvar("use_self_busywait", 0,
                                         "Use custom busy-wait code.")
+        self.use_hybrid_wait = self.create_gvar("use_hybrid_wait", 0,
+                                        "Sleep until shortly before the frame deadline, then busy-wait.")
         self.showfps = self.create_gvar("showfps", 0, "Display FPS counter.")
+        self.use_component_store = self.create_gvar("use_component_store", 0,
+                                        "Store the motion of new entities in NumPy arrays.")
         
+        # Instantiate the quality governor, which creates its own gvars.
+        self.__governor = governor.QualityGovernor(self)
+        self.quality = self.__governor.quality
+
         # Create gvars for the renderer.
         self.width = self.create_gvar("width", 640, "Start-up width of the window.", min=0)
         self.height = self.create_gvar("height", 480, "Start-up height of the window.", min=0)
@@ -66,7 +77,10 @@ class LLEngine():
         # Create a list of timers. 
         self.__timers = []
         
-        # Configure entities.
+        # Configure entities. The registry stores all the entities, while the
+        # linked list keeps them in creation order, which they are drawn in.
+        self.registry = entity.EntityRegistry()
+        self.components: entity.ComponentStore = None
         self.__entity_head: entity.Entity = None
         self.__entity_tail: entity.Entity = None
         self.__entity_types = {
@@ -85,7 +99,9 @@ class LLEngine():
             "element":  ui.Element,
             "frame":    ui.Frame,
             "image":    ui.Image,
-            "text":     ui.Text
+            "text":     ui.Text,
+            "hud":      ui.Hud,
+            "listview": ui.ListView
         }
         self.__focused_text: ui.Text = None
         self.__focused_keydown = ("", pygame.K_0)
@@ -95,6 +111,9 @@ class LLEngine():
         # Declare a text element for the graphical FPS counter.
         self.__fps_counter: ui.Text = None
 
+        # The game resolution that the UI layout was last resolved against.
+        self.__layout_resolution = None
+
         # Instantiate the physics engine.
         self.__physics = entity.LLPhysics(self)
         self.physics_enabled = True
@@ -106,15 +125,17 @@ class LLEngine():
     def set_game(self, game):
         self.__game = game
 
-    # Start the main game loop.
-    def init(self):
+    # Initialize the game without starting the main game loop. This is done by
+    # init(), but can also be called on its own to drive the game headless, e.g.
+    # from a benchmark, with SDL's dummy video driver.
+    def prepare(self):
         # Fail if the game attribute has not been allocated.
         if not self.__game:
             self.console.error("Could not launch engine due to missing game field!")
 
         # Set the video mode temporarily, so that we can configure all image surfaces,
         # alongside the missing texture object.
-        screen = pygame.display.set_mode((1, 1), pygame.RESIZABLE)
+        pygame.display.set_mode((1, 1), pygame.RESIZABLE)
         missing_dir = os.path.join(os.path.dirname(__file__), "assets/missing.png")
         if not os.path.isfile(missing_dir):
             self.console.error(f"\"assets/missing.png\" not found!")
@@ -122,13 +143,18 @@ class LLEngine():
 
         # Record the instantiation of the engine and initialize the game.
         self.console.log("Instantiating engine")
-        exception_thrown = False
         self.__game.init()
 
         # Fix the minimum values of the game's width and height.
         self.width.set_min(self.game_width.get())
         self.height.set_min(self.game_height.get())
 
+    # Start the main game loop.
+    def init(self):
+        # Initialize the game.
+        self.prepare()
+        exception_thrown = False
+
         # Parse any command-line arguments using argparse, which can be used for
         # modifying any game variables.
         parser = argparse.ArgumentParser(prog=self.__name,
@@ -248,23 +274,37 @@ class LLEngine():
                         timer.func(*timer.args)
                 self.__timers[:] = [timer for timer in self.__timers if timer.end >= start]
 
+                # Resolve the layout of all UI elements again if the game resolution
+                # has changed since it was last resolved.
+                self.__layout()
+
+                # At the lowest quality level, only render every other frame.
+                render = (self.quality.get() >= governor.QUALITY_FULLRATE
+                          or self.globals.frames % 2 == 0)
+
                 # Clear the background surface prior to any drawing.
-                background.fill((0, 0, 0))
+                if render:
+                    background.fill((0, 0, 0))
 
                 # Blit all background UI elements.
-                element = self.__background_head
+                element = self.__background_head if render else None
                 while element:
                     if element.enabled:
                         element.invoke_event("draw", background)
                     element = element.next
 
-                # Blit all entities.
-                entity = self.__entity_head
+                # Tick all entities that have a per-frame event, in creation order.
+                # This is done in its own pass before any entity is drawn.
+                for entity in self.registry.get_ticking():
+                    if entity.active:
+                        entity.invoke_event("per_frame")
+
+                # Blit all entities, in creation order.
+                entity = self.__entity_head if render else None
                 while entity:
                     # If the entity is active, call some important events.
                     if entity.active:
-                        # Call the per-frame and draw events.
-                        entity.invoke_event("per_frame")
+                        # Call the draw event.
                         if entity.draw:
                             entity.invoke_event("draw", background)
 
@@ -276,32 +316,41 @@ class LLEngine():
                     entity = entity.next
 
                 # Blit all foreground UI elements.
-                element = self.__element_head
+                element = self.__element_head if render else None
                 while element:
                     if element.enabled:
                         element.invoke_event("draw", background)
                     element = element.next
 
                 # Blit the FPS counter if it is configured.
-                if self.showfps.get() and self.__fps_counter:
+                if self.showfps.get() and self.__fps_counter and render:
                     self.__fps_counter.invoke_event("draw", background)
 
-                # Scale the background surface onto the current resolution of the window.
-                scale = min(screen.get_width() / self.game_width.get(), 
-                            screen.get_height() / self.game_height.get())
-                frame = pygame.transform.scale_by(background, scale)
-                
-                # Manipulate the position of the frame surface.
-                frame_rect = frame.get_rect(center = screen.get_rect().center)
-                frame_rect = frame_rect.move(self.origin.x * scale, -self.origin.y * scale)
+                if render:
+                    # Scale the background surface onto the current resolution of the window.
+                    scale = min(screen.get_width() / self.game_width.get(), 
+                                screen.get_height() / self.game_height.get())
+                    frame = pygame.transform.scale_by(background, scale)
+                    
+                    # Manipulate the position of the frame surface.
+                    frame_rect = frame.get_rect(center = screen.get_rect().center)
+                    frame_rect = frame_rect.move(self.origin.x * scale, -self.origin.y * scale)
+
+                    # Blit the frame onto the screen and update the rendered output.
+                    screen.blit(frame, frame_rect)
+                    pygame.display.update()
 
-                # Blit the frame onto the screen and update the rendered output.
-                screen.blit(frame, frame_rect)
-                pygame.display.update()
+                # Let the quality governor know how long this frame took to process,
+                # excluding the frame limiter.
+                self.__governor.update(time.perf_counter() - start)
 
                 # Limit the framerate (if specified) and calculate the delta time and fps.
                 end = 0
-                if not self.use_self_busywait.get():
+                if self.use_hybrid_wait.get() and self.fps_max.get() > 0:
+                    # Sleep for most of the frame and busy-wait for the rest.
+                    end = self.__pacer.wait(start + 1 / self.fps_max.get())
+                    self.globals.pacing_error = self.__pacer.error
+                elif not self.use_self_busywait.get():
                     # Just call clock.tick() if using Pygame's Clock class.
                     self.__clock.tick(self.fps_max.get())
                     end = time.perf_counter()
@@ -334,7 +383,11 @@ class LLEngine():
                         self.__fps_counter.enabled = True
                     
                     # Display the current FPS.
-                    self.__fps_counter.set_text(f"fps: {self.globals.fps:.0f}")
+                    if self.use_hybrid_wait.get():
+                        self.__fps_counter.set_text(f"fps: {self.globals.fps:.0f}\n"
+                                                    f"err: {self.globals.pacing_error * 1000:.2f}ms")
+                    else:
+                        self.__fps_counter.set_text(f"fps: {self.globals.fps:.0f}")
 
         # If an exception is caught, mark it and log it.
         except Exception as ex:
@@ -376,7 +429,8 @@ class LLEngine():
         # Create a new entity by the classname.
         newEnt = self.__entity_types[classname](self, classname)
 
-        # Link the entity to the entities linked list.
+        # Add the entity to the registry and link it to the entities linked list.
+        self.registry.add(newEnt, self.__get_components())
         newEnt.prev = self.__entity_tail
         if newEnt.prev:
             newEnt.prev.next = newEnt
@@ -389,7 +443,9 @@ class LLEngine():
     
     # Activate an entity, thus rendering it and allowing interactions with it.
     def activate_entity(self, ent):
-        ent.active = True
+        if not ent.active:
+            ent.active = True
+            self.registry.activated(ent)
         ent.invoke_event("activated")
         self.__physics.insert_entity(ent)
     
@@ -408,6 +464,34 @@ class LLEngine():
     # Return the first entity instance in the engine.
     def entity_head(self):
         return self.__entity_head
+
+    # Get the component store that new entities should be added to, or None if
+    # the component store is disabled.
+    def __get_components(self):
+        if not self.use_component_store.get():
+            return None
+
+        # Create the component store when it is first used, as long as NumPy is
+        # installed.
+        if self.components == None:
+            if entity.components.numpy == None:
+                self.console.warn("use_component_store requires NumPy, which is not installed.")
+                self.use_component_store.set(0)
+                return None
+            self.components = entity.ComponentStore()
+        return self.components
+
+    # Retrieve an entity by its id, or None if it no longer exists.
+    def get_entity(self, entid):
+        return self.registry.get(entid)
+
+    # Retrieve the set of entities with a given class name.
+    def find_entities_by_class(self, classname):
+        return self.registry.by_class(classname)
+
+    # Retrieve the set of entities with a given movetype.
+    def find_entities_by_movetype(self, movetype):
+        return self.registry.by_movetype(movetype)
     
     # Register a new element type by classname.
     def register_ui_classname(self, name, element_type):
@@ -480,6 +564,18 @@ class LLEngine():
     def focused(self):
         return self.__focused_text
     
+    # Resolve the rects of all UI elements, only if the game resolution changed.
+    def __layout(self):
+        resolution = (self.game_width.get(), self.game_height.get())
+        if resolution == self.__layout_resolution:
+            return
+        self.__layout_resolution = resolution
+        for head in (self.__background_head, self.__element_head, self.__fps_counter):
+            element = head
+            while element:
+                element.resolve()
+                element = element.next
+
     # Manipulate the focused text buffer.
     def __manipulate_text(self):
         current = self.__focused_text.get_text()
@@ -516,9 +612,22 @@ class LLEngine():
     # Clear all entities.
     def clear_entities(self):
         self.__physics.clear_entities()
+        self.registry.clear()
         self.__entity_head = None
         self.__entity_tail = None
 
+    # Merge contiguous map tiles that collide the same way into larger colliders.
+    # Call this once a level has been loaded, before its tiles are activated.
+    def merge_colliders(self):
+        self.__physics.merge_colliders(list(self.registry.entities))
+
+    # Set the cell size of the lowest level of the physics engine's grids. Each
+    # level above it doubles the cell size, and entities go into the level that
+    # matches their size. Call this when a scene is loaded, as clearing the entities
+    # restores the default cell size.
+    def set_cell_size(self, cellsize):
+        self.__physics.set_cell_size(cellsize)
+
     # For a given set of start/end points forming a rectangle, return all the 
     # entities that are found within said rectangle.
     def query_entities(self, start, end, include_nocollide = True):
@@ -526,27 +635,24 @@ class LLEngine():
         diff = end - start
         hitbox = pygame.Rect(start.x, -start.y, diff.x, -diff.y)
 
-        # Get a list of entities within the appropriate grid cells from the
-        # physics engine, and check whether they overlap with the given
-        # rectangle, and return it.
-        entities = self.__physics.query_entities(start, end, include_nocollide)
-        entities[:] = [ent for ent in entities if hitbox.colliderect(ent._rect)]
-        return entities
+        # Walk through the entities within the appropriate grid cells from the
+        # physics engine, and return those that overlap with the given rectangle.
+        return [ent for ent in self.__physics.iter_entities(start, end, include_nocollide)
+                if hitbox.colliderect(ent._rect)]
+    
+    # Iterate over the areas of the grid cells that an entity is in.
+    def get_cell_rects(self, ent):
+        return self.__physics.get_cell_rects(ent)
     
     # Get the number of entities that currently exist.
     def count_entities(self, active = True):
-        ent = self.entity_head()
-        count = 0
-        while ent:
-            if (active and ent.active) or not active:
-                count += 1
-            ent = ent.next
-        return count
+        return self.registry.count(active)
     
     # Delete an entity from the engine, thus unlinking it from the entity linked list.
     def __delete_entity(self, ent):
-        # Remove the entity from the physics engine's grid.
+        # Remove the entity from the physics engine's grid and the registry.
         self.__physics.remove_entity(ent)
+        self.registry.remove(ent)
 
         # Unlink the entity from the entity linked list and delete it.
         if not ent.prev:
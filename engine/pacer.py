@@ -0,0 +1,54 @@
+"""A hybrid frame pacer, which sleeps for the majority of a frame and
+busy-waits for the remainder, in order to hit a frame deadline accurately
+without using up the CPU for the entire frame."""
+
+import time
+
+# Named constants defining default pacer properties.
+DEFAULT_SPIN_MARGIN = 0.0015    # Time left before the deadline that is always busy-waited (s).
+DEFAULT_OVERSHOOT = 0.001       # Initial estimate of how late time.sleep() wakes up (s).
+OVERSHOOT_SMOOTHING = 0.1       # Weight of each new overshoot measurement.
+OVERSHOOT_MAX = 0.01            # Upper bound of the overshoot estimate (s).
+
+# Hybrid sleep-then-spin frame pacer.
+class FramePacer():
+    # Construct a new frame pacer.
+    def __init__(self, spin_margin = DEFAULT_SPIN_MARGIN):
+        # Time before the deadline where we stop sleeping and start spinning.
+        self.spin_margin = spin_margin
+
+        # Self-calibrated estimate of how much longer time.sleep() takes than
+        # requested.
+        self.__overshoot = DEFAULT_OVERSHOOT
+
+        # The error between the previous deadline and when we actually woke up (s).
+        # Positive values mean that we were late.
+        self.error = 0.0
+
+    # Get the current sleep overshoot estimate.
+    def get_overshoot(self):
+        return self.__overshoot
+
+    # Wait until the given deadline (as a time.perf_counter() timestamp) and return
+    # the timestamp of when we finished waiting.
+    def wait(self, deadline):
+        # Sleep until shortly before the deadline, accounting for how late the
+        # operating system usually wakes us up.
+        now = time.perf_counter()
+        sleep = deadline - now - self.spin_margin - self.__overshoot
+        if sleep > 0:
+            time.sleep(sleep)
+            woke = time.perf_counter()
+
+            # Calibrate the overshoot estimate against what we just measured.
+            overshoot = min(max(woke - now - sleep, 0), OVERSHOOT_MAX)
+            self.__overshoot += (overshoot - self.__overshoot) * OVERSHOOT_SMOOTHING
+            now = woke
+
+        # Busy-wait for the remainder of the frame.
+        while now < deadline:
+            now = time.perf_counter()
+
+        # Record the pacing error and return the end timestamp.
+        self.error = now - deadline
+        return now
@@ -2,4 +2,6 @@ from .udim2 import UDim2
 from .element import *
 from .frame import Frame
 from .image import Image
+from .hud import Hud
+from .listview import ListView
 from .text import *
\ No newline at end of file
@@ -24,6 +24,7 @@ class Element():
         self.__position = UDim2(0, 0, 0, 0)
         self.__size = UDim2(0, 0, 0, 0)
         self.layer = LAYER_FOREGROUND
+        self._revision = 0 # Bumped whenever the appearance of this element changes.
 
         # Create a few crucial events.
         self.set_event(Event("draw", placeholder))
@@ -41,21 +42,57 @@ class Element():
     def get_position(self):
         return self.__position
     
-    # Set the position of this element.
+    # Set the position of this element. The rect is only resolved again if the
+    # position actually changed.
     def set_position(self, udim2):
+        if udim2 == self.__position:
+            return
         self.__position = udim2
-        self._rect.left = self._engine.game_width.get() * udim2.x.scale + udim2.x.offset
-        self._rect.top = self._engine.game_height.get() * udim2.y.scale + udim2.y.offset
+        self._rect.topleft = udim2.resolve(*self.__resolution())
+        self._changed()
 
     # Get the size of this element.
     def get_size(self):
         return self.__size
     
-    # Set the size of this element.
+    # Set the size of this element. The rect is only resolved again if the size
+    # actually changed.
     def set_size(self, udim2):
+        if udim2 == self.__size:
+            return
         self.__size = udim2
-        self._rect.width = self._engine.game_width.get() * udim2.x.scale + udim2.x.offset
-        self._rect.height = self._engine.game_height.get() * udim2.y.scale + udim2.y.offset
+        size = self._rect.size
+        self._rect.size = udim2.resolve(*self.__resolution())
+        self._changed()
+        if self._rect.size != size:
+            self._resized()
+
+    # Resolve the rect of this element against the current game resolution. This
+    # is called by the engine whenever the game resolution changes.
+    def resolve(self):
+        size = self._rect.size
+        resolution = self.__resolution()
+        self._rect.topleft = self.__position.resolve(*resolution)
+        self._rect.size = self.__size.resolve(*resolution)
+        self._changed()
+        if self._rect.size != size:
+            self._resized()
+
+    # Called when the size of the rect of this element changes.
+    def _resized(self):
+        pass
+
+    # Get the current game resolution.
+    def __resolution(self):
+        return (self._engine.game_width.get(), self._engine.game_height.get())
+
+    # Get the revision of this element, which changes whenever its appearance does.
+    def get_revision(self):
+        return self._revision
+
+    # Mark the appearance of this element as changed.
+    def _changed(self):
+        self._revision += 1
 
     # Retrieve an event from this element.
     def get_event(self, name):
@@ -13,8 +13,19 @@ class Frame(element.Element):
         self.get_event("draw").set_func(Frame.draw_frame)
 
         # Rectangle properties.
-        self.colour = pygame.Color(0, 0, 0)
+        self.__colour = pygame.Color(0, 0, 0)
+
+    # Get the colour of this frame.
+    @property
+    def colour(self):
+        return self.__colour
+
+    # Set the colour of this frame.
+    @colour.setter
+    def colour(self, colour):
+        self.__colour = colour
+        self._changed()
 
     # Draw this frame.
     def draw_frame(self, screen):
-        pygame.draw.rect(screen, self.colour, self._rect)
\ No newline at end of file
+        pygame.draw.rect(screen, self.__colour, self._rect)
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""A bitmap glyph atlas, which rasterizes a font once for a given size and
+colour, so that strings can be drawn by blitting glyphs instead of being
+rendered through FreeType each time."""
+
+import pygame
+
+# The range of characters that are rasterized into the atlas up-front.
+# Any other characters are rasterized on demand.
+FIRST_CHAR = 32
+LAST_CHAR = 126
+
+# Cached glyph atlases, keyed by (font key, size, colour, anti-aliasing).
+cached_atlases = dict()
+
+# Glyph atlas class.
+class GlyphAtlas():
+    # Construct a new glyph atlas by rasterizing the given font.
+    def __init__(self, font, antialiasing, colour):
+        # Store the font properties used for rasterizing glyphs.
+        self.__font = font
+        self.__antialiasing = antialiasing
+        self.__colour = colour
+        self.height = font.get_height()
+
+        # Render every character in the range onto a single surface, recording the
+        # area of each glyph within the surface.
+        chars = [chr(i) for i in range(FIRST_CHAR, LAST_CHAR + 1)]
+        width = sum(font.size(char)[0] for char in chars)
+        self.__surface = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+        self.__glyphs = dict()
+        x = 0
+        for char in chars:
+            glyph = font.render(char, antialiasing, colour)
+            self.__surface.blit(glyph, (x, 0))
+            self.__glyphs[char] = (self.__surface, pygame.Rect(x, 0, glyph.get_width(), self.height))
+            x += glyph.get_width()
+
+    # Get the surface and area of a glyph, rasterizing it if it isn't in the atlas.
+    def __get_glyph(self, char):
+        if char not in self.__glyphs:
+            glyph = self.__font.render(char, self.__antialiasing, self.__colour)
+            self.__glyphs[char] = (glyph, glyph.get_rect())
+        return self.__glyphs[char]
+
+    # Get the size of a string if it were drawn with this atlas.
+    def size(self, string):
+        return (sum(self.__get_glyph(char)[1].width for char in string), self.height)
+
+    # Draw a string onto a surface at the given position.
+    def render(self, surface, string, position):
+        x, y = position
+        for char in string:
+            glyph, area = self.__get_glyph(char)
+            surface.blit(glyph, (x, y), area)
+            x += area.width
+
+# Retrieve the glyph atlas for a font, creating it if it is not cached.
+def get_atlas(key, font, antialiasing, colour):
+    key = (*key, tuple(colour), antialiasing)
+    if key not in cached_atlases:
+        cached_atlases[key] = GlyphAtlas(font, antialiasing, colour)
+    return cached_atlases[key]
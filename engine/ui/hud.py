@@ -0,0 +1,90 @@
+"""A HUD container element, which composites its children onto a single
+cached surface and blits it once per frame. Only the children that have
+changed since the previous frame are re-composited."""
+
+import pygame
+
+from . import element
+
+# HUD element.
+class Hud(element.Element):
+    # Construct a new HUD.
+    def __init__(self, engine, classname):
+        # Call the element constructor and modify its default properties.
+        super().__init__(engine, classname)
+        self.get_event("draw").set_func(Hud.draw_hud)
+
+        # HUD properties.
+        self.__children = []
+        self.__states = dict()  # The state of each child when it was last composited.
+        self.__surface = None
+        self.__origin = None    # The position of the HUD when it was last composited.
+
+    # Add an element to this HUD. The element is removed from the engine's element
+    # list, as it will now be drawn by this HUD instead.
+    def add(self, elem):
+        self._engine.delete_ui_element(elem)
+        elem.prev = None
+        elem.next = None
+        self.__children.append(elem)
+        self.__surface = None
+
+    # Remove an element from this HUD.
+    def remove(self, elem):
+        self.__children.remove(elem)
+        self.__states.pop(elem, None)
+        self.__surface = None
+
+    # Get the elements in this HUD.
+    def get_children(self):
+        return self.__children
+
+    # Resolve the rect of this HUD and all of its children.
+    def resolve(self):
+        super().resolve()
+        for child in self.__children:
+            child.resolve()
+
+    # Composite any children that have changed onto the cached surface.
+    def __composite(self):
+        # Re-create the surface and redraw everything if the size or position of
+        # this HUD changed.
+        if (not self.__surface or self.__surface.get_size() != self._rect.size
+            or self.__origin != self._rect.topleft):
+            self.__surface = pygame.Surface(self._rect.size, pygame.SRCALPHA)
+            self.__origin = self._rect.topleft
+            self.__states.clear()
+
+        # Collect the areas covered by each changed child, both before and after
+        # the change.
+        dirty = []
+        for child in self.__children:
+            state = (child.get_revision(), child.enabled, tuple(child._rect))
+            old = self.__states.get(child)
+            if state != old:
+                if old:
+                    dirty.append(pygame.Rect(old[2]))
+                dirty.append(child._rect.copy())
+                self.__states[child] = state
+        if not dirty:
+            return
+
+        # Clear each dirty area and redraw every child that overlaps it, in order,
+        # clipped to said area.
+        for rect in dirty:
+            rect.move_ip(-self._rect.left, -self._rect.top)
+            self.__surface.set_clip(rect)
+            self.__surface.fill(pygame.Color(0, 0, 0, 0))
+            for child in self.__children:
+                if not child.enabled:
+                    continue
+                child._rect.move_ip(-self._rect.left, -self._rect.top)
+                if child._rect.colliderect(rect):
+                    child.invoke_event("draw", self.__surface)
+                child._rect.move_ip(self._rect.left, self._rect.top)
+        self.__surface.set_clip(None)
+
+    # Draw this HUD.
+    def draw_hud(self, screen):
+        self.__composite()
+        screen.blit(self.__surface, self._rect)
@@ -20,6 +20,9 @@ class Image(element.Element):
         self.__image = None
         self.__texture = engine.missing # Default to the missing texture (although
                                         # it won't be stretched).
+        self.__scale = True
+        self.__offset = (0, 0)
+        self.__source = None    # The image, scale and offset the texture was made from.
 
     # Load from an image.
     def load(self, path):
@@ -46,20 +49,33 @@ class Image(element.Element):
                 fallback()
                 return
             
-    # Upon setting the size of this image, re-scale the texture appropriately.
+    # Upon setting the size of this image, re-scale the texture appropriately. If
+    # the size is unchanged, the texture is only re-scaled if the image, scale or
+    # offset it was made from has changed.
     def set_size(self, udim2, scale = True, offset = (0, 0)):
+        self.__scale = scale
+        self.__offset = tuple(offset)
+        size = self._rect.size
         super().set_size(udim2)
+        if self._rect.size == size and self.__source != (self.__image, self.__scale, self.__offset):
+            self._resized()
+
+    # Re-scale the texture to the size of this image.
+    def _resized(self):
         res = (self._rect.width, self._rect.height)
-        if scale:
+        if self.__scale:
             image = pygame.transform.scale(self.__image, res)
         else:
             image = self.__image
         self.__texture = pygame.Surface(res, pygame.SRCALPHA)
-        self.__texture.blit(image, (0, 0), (*offset, *res))
+        self.__texture.blit(image, (0, 0), (*self.__offset, *res))
+        self.__source = (self.__image, self.__scale, self.__offset)
+        self._changed()
 
     # Flip this image.
     def flip(self, flip_x = False, flip_y = False):
         self.__texture = pygame.transform.flip(self.__texture, flip_x, flip_y)
+        self._changed()
 
     # Draw this frame.
     def draw_image(self, screen):
@@ -0,0 +1,95 @@
+"""A virtualized list element, which displays a page of items from a list of
+any length. Only the visible rows exist as elements, and they are re-bound
+to different items as the list is scrolled."""
+
+from . import element
+from .udim2 import UDim2
+
+# List view element.
+class ListView(element.Element):
+    # Construct a new list view.
+    def __init__(self, engine, classname):
+        # Call the element constructor and modify its default properties.
+        super().__init__(engine, classname)
+        self.get_event("draw").set_func(ListView.draw_list)
+
+        # List view properties.
+        self.row_height = 20
+        self.__rows = []        # The visible row elements.
+        self.__count = 0        # The number of items in the list.
+        self.__bind = None      # Function that binds an item to a row: bind(row, index).
+        self.__top = 0          # The index of the item in the first row.
+        self.__selected = 0     # The index of the selected item.
+
+    # Add a row element to this list view. The element is removed from the engine's
+    # element list, as it will now be drawn by this list view instead.
+    def add_row(self, row):
+        self._engine.delete_ui_element(row)
+        row.prev = None
+        row.next = None
+        self.__rows.append(row)
+        self.__position_rows()
+
+    # Set the number of items in the list and the function used for binding an
+    # item to a row, and scroll back to the top.
+    def set_source(self, count, bind):
+        self.__count = count
+        self.__bind = bind
+        self.__top = -1
+        self.select(0)
+
+    # Get the number of items in the list.
+    def get_count(self):
+        return self.__count
+
+    # Get the index of the selected item.
+    def get_selected(self):
+        return self.__selected
+
+    # Select an item (wrapping around), scrolling to its page if necessary.
+    def select(self, index):
+        # Wrap the index around the list.
+        self.__selected = index % self.__count if self.__count else 0
+
+        # If the item is on another page, re-bind all the rows.
+        page = len(self.__rows)
+        top = (self.__selected // page) * page if page else 0
+        if top != self.__top:
+            self.__top = top
+            self.refresh()
+
+    # Get the row element displaying the selected item.
+    def get_selected_row(self):
+        if not self.__rows:
+            return None
+        return self.__rows[self.__selected - self.__top]
+
+    # Re-bind the visible rows to their items.
+    def refresh(self):
+        for i, row in enumerate(self.__rows):
+            index = self.__top + i
+            row.enabled = index < self.__count
+            if row.enabled:
+                self.__bind(row, index)
+
+    # Upon setting the position of this list view, move the rows with it.
+    def set_position(self, udim2):
+        super().set_position(udim2)
+        self.__position_rows()
+
+    # Resolve the rect of this list view and all of its rows.
+    def resolve(self):
+        super().resolve()
+        for row in self.__rows:
+            row.resolve()
+
+    # Stack the rows below the position of this list view.
+    def __position_rows(self):
+        for i, row in enumerate(self.__rows):
+            row.set_position(self.get_position() + UDim2(0, 0, 0, i * self.row_height))
+
+    # Draw the visible rows.
+    def draw_list(self, screen):
+        for row in self.__rows:
+            if row.enabled:
+                row.invoke_event("draw", screen)
@@ -1,10 +1,12 @@
 """A text element that displays text, which can also be updated
 if chosen."""
 
+import os
 import pygame
 
 from ..event import Event
 from . import element
+from . import glyphatlas
 
 # Text alignment options.
 X_LEFT      = 0
@@ -14,6 +16,10 @@ Y_TOP       = 0
 Y_CENTRE    = 1
 Y_BOTTOM    = 2
 
+# Cached fonts, keyed by (path, size). These are shared across all text
+# elements, so the style of a font must be set before every use of it.
+cached_fonts = dict()
+
 # Text element.
 class Text(element.Element):
     # Construct a new text.
@@ -25,7 +31,10 @@ class Text(element.Element):
         # Text properties.
         self.__text = ""
         self.__texture = None
+        self._changed()
         self.__font = None
+        self.__atlaskey = None # Set when rendering through a glyph atlas.
+        self.__lines = None    # Each line drawn from the glyph atlas, as [string, x, y].
         self.__x_align = X_LEFT
         self.__y_align = Y_TOP
         self.__colour = pygame.Color(0, 0, 0)
@@ -41,31 +50,54 @@ class Text(element.Element):
     # Load a font from a local font file. If the font path is invalid,
     # Pygame will default to the default font.
     def load_localfont(self, path, size = 12):
+        self.__atlaskey = None
         try:
-            self.__font = pygame.font.Font(path, size)
+            self.__font = get_font(path, size)
         except FileNotFoundError:
             self._engine.console.warn(f"font path \"{path}\" is invalid!")
             self.load_default()
+            return
+        self.__texture = None
+        self._changed()
     
     # Load a font from a system font. If the font provided does not exist, 
     # Pygame will default to the default font.
     def load_systemfont(self, name, size = 12):
+        self.__atlaskey = None
         if not pygame.font.match_font(name):
             self._engine.console.warn(f"system font \"{name}\" does not exist!")
         self.__font = pygame.font.SysFont(name, size)
+        self.__texture = None
+        self._changed()
 
     # Load the default font.
     def load_default(self, size = 12):
-        self.__font = pygame.font.Font(pygame.font.get_default_font(), size)
+        self.__atlaskey = None
+        self.__font = get_font(None, size)
+        self.__texture = None
+        self._changed()
+
+    # Load a fixed-size pixel font from a local font file, which will be drawn
+    # from a glyph atlas rather than being rendered by FreeType each time.
+    def load_bitmapfont(self, path, size = 12):
+        self.load_localfont(path, size)
+        self.__atlaskey = (os.path.abspath(path), size)
+        self.__texture = None
+        self._changed()
 
     # Get the current text buffer.
     def get_text(self):
         return self.__text
     
-    # Set the text buffer.
+    # Set the text buffer. The texture is only re-rendered if the text actually
+    # changed, and only the changed glyphs are redrawn where possible.
     def set_text(self, text):
+        if text == self.__text:
+            return
         self.__text = text
-        self.__texture = None
+        if not self.__update_glyphs():
+            self.__texture = None
+        self._changed()
 
     # Get the current x-alignment.
     def get_x_align(self):
@@ -75,6 +107,7 @@ class Text(element.Element):
     def set_x_align(self, x_align):
         self.__x_align = x_align
         self.__texture = None
+        self._changed()
     
     # Get the current y-alignment.
     def get_y_align(self):
@@ -84,6 +117,7 @@ class Text(element.Element):
     def set_y_align(self, y_align):
         self.__y_align = y_align
         self.__texture = None
+        self._changed()
 
     # Get whether this text is anti-aliased.
     def get_antialiased(self):
@@ -93,6 +127,7 @@ class Text(element.Element):
     def set_antialiased(self, toggle):
         self.__antialiasing = toggle
         self.__texture = None
+        self._changed()
 
     # Get the colour of this text.
     def get_colour(self):
@@ -100,8 +135,11 @@ class Text(element.Element):
     
     # Set the colour of this text.
     def set_colour(self, colour):
+        if colour == self.__colour:
+            return
         self.__colour = colour
         self.__texture = None
+        self._changed()
 
     # Get whether this text is bold.
     def get_bold(self):
@@ -111,6 +149,7 @@ class Text(element.Element):
     def set_bold(self, bold):
         self.__bold = bold
         self.__texture = None
+        self._changed()
 
     # Get whether this text is italic.
     def get_italic(self):
@@ -120,6 +159,7 @@ class Text(element.Element):
     def set_italic(self, italic):
         self.__italic = italic
         self.__texture = None
+        self._changed()
 
     # Get whether this text is underlined.
     def get_underline(self):
@@ -129,6 +169,11 @@ class Text(element.Element):
     def set_underline(self, underline):
         self.__underline = underline
         self.__texture = None
+        self._changed()
+
+    # Upon resizing this text, re-render the texture to the new size.
+    def _resized(self):
+        self.__texture = None
 
     # Draw this text.
     def draw_text(self, screen):
@@ -138,43 +183,123 @@ class Text(element.Element):
 
         # Re-render the text surface if the texture is None.
         if not self.__texture:
-            # Set the font properties.
-            self.__font.set_bold(self.__bold)
-            self.__font.set_italic(self.__italic)
-            self.__font.set_underline(self.__underline)
+            # Set the font properties before measuring or rendering anything with it.
+            self.__set_style()
             
             # Create a new transparent surface beforehand, which all text
             # surfaces will be blit onto.
             self.__texture = pygame.Surface((self._rect.width, self._rect.height), pygame.SRCALPHA)
             self.__texture.fill(pygame.Color(0, 0, 0, 0))
 
+            # Use the glyph atlas if we have one, as long as we don't need any
+            # styles that it can't provide.
+            atlas = None
+            self.__lines = None
+            if self.__atlaskey and not (self.__bold or self.__italic or self.__underline):
+                atlas = glyphatlas.get_atlas(self.__atlaskey, self.__font,
+                                             self.__antialiasing, self.__colour)
+                self.__lines = []
+
             # Split the text buffer into strings separated by newline, and
             # enumerate through each string.
             strings = self.__text.split("\n")
             for i, str in enumerate(strings):
-                # Render this text buffer using the font.
-                texture = self.__font.render(str, self.__antialiasing,
-                                                    self.__colour)
+                # Render this text buffer using the font, or measure it if we are
+                # drawing it from the glyph atlas.
+                if atlas:
+                    width, height = atlas.size(str)
+                else:
+                    texture = self.__font.render(str, self.__antialiasing,
+                                                        self.__colour)
+                    width, height = texture.get_size()
                 
                 # Configure the alignment.
                 if self.__x_align == X_LEFT:
                     x_offset = 0
                 elif self.__x_align == X_CENTRE:
-                    x_offset = max((self._rect.width - texture.get_width()) / 2, 0)
+                    x_offset = max((self._rect.width - width) / 2, 0)
                 else:
-                    x_offset = max(self._rect.width - texture.get_width(), 0)
+                    x_offset = max(self._rect.width - width, 0)
                 if self.__y_align == Y_TOP:
                     y_offset = 0
                 elif self.__y_align == Y_CENTRE:
-                    y_offset = max((self._rect.height - texture.get_height()) / 2
+                    y_offset = max((self._rect.height - height) / 2
                                    - (len(strings) - 1) * self.__font.get_linesize() / 2, 0)
                 else:
-                    y_offset = max(self._rect.height - texture.get_height()
+                    y_offset = max(self._rect.height - height
                                    - (len(strings) - 1) * self.__font.get_linesize(), 0)
                 y_offset += i * self.__font.get_linesize()
                 
-                # Blit the text surface onto the transparent surface.
-                self.__texture.blit(texture, (x_offset, y_offset))
+                # Blit the text surface (or the glyphs) onto the transparent surface.
+                if atlas:
+                    atlas.render(self.__texture, str, (x_offset, y_offset))
+                    self.__lines.append([str, x_offset, y_offset])
+                else:
+                    self.__texture.blit(texture, (x_offset, y_offset))
 
         # Render the text.
-        screen.blit(self.__texture, self._rect)
\ No newline at end of file
+        screen.blit(self.__texture, self._rect)
+
+    # Set the properties of the font. The font is shared with other text elements,
+    # so this must be done before measuring or rendering anything with it,
+    # including through a glyph atlas.
+    def __set_style(self):
+        self.__font.set_bold(self.__bold)
+        self.__font.set_italic(self.__italic)
+        self.__font.set_underline(self.__underline)
+
+    # Redraw only the glyphs that differ from the currently-rendered texture. This
+    # is only possible if the texture was drawn from a glyph atlas, and each line
+    # is still as wide as before (e.g. fixed-width numeric fields), so that the
+    # alignment doesn't change. Returns whether the texture was updated.
+    def __update_glyphs(self):
+        # Check that the texture was drawn from the glyph atlas.
+        if not self.__texture or self.__lines == None:
+            return False
+
+        # Set the font properties, as the atlas may rasterize glyphs on demand.
+        self.__set_style()
+        atlas = glyphatlas.get_atlas(self.__atlaskey, self.__font,
+                                     self.__antialiasing, self.__colour)
+
+        # Check that the number of lines and the width of each line is unchanged.
+        strings = self.__text.split("\n")
+        if len(strings) != len(self.__lines):
+            return False
+        for str, line in zip(strings, self.__lines):
+            if atlas.size(str)[0] != atlas.size(line[0])[0]:
+                return False
+
+        # Redraw each line that changed.
+        for str, line in zip(strings, self.__lines):
+            # Skip this line if it hasn't changed.
+            old, x_offset, y_offset = line
+            if str == old:
+                continue
+
+            # If every glyph keeps its width, only clear and redraw the glyphs
+            # that changed. Otherwise, clear and redraw the whole line.
+            if len(str) == len(old) and all(atlas.size(new)[0] == atlas.size(prev)[0]
+                                            for new, prev in zip(str, old)):
+                x = x_offset
+                for new, prev in zip(str, old):
+                    width = atlas.size(new)[0]
+                    if new != prev:
+                        self.__texture.fill(pygame.Color(0, 0, 0, 0),
+                                            (x, y_offset, width, atlas.height))
+                        atlas.render(self.__texture, new, (x, y_offset))
+                    x += width
+            else:
+                self.__texture.fill(pygame.Color(0, 0, 0, 0),
+                                    (x_offset, y_offset, atlas.size(str)[0], atlas.height))
+                atlas.render(self.__texture, str, (x_offset, y_offset))
+            line[0] = str
+        return True
+
+# Retrieve a font from the font cache, loading it if it is not cached.
+# A path of None refers to the default font.
+def get_font(path, size):
+    key = (os.path.abspath(path) if path else None, size)
+    if key not in cached_fonts:
+        cached_fonts[key] = pygame.font.Font(path, size)
+    return cached_fonts[key]
@@ -1,71 +1,100 @@
 """A 2-dimensional struct representing a UI element's scale and offset."""
 
-# 2-dimensional co-ordinates of a UI element.
+from collections import namedtuple
+
+# 2-dimensional co-ordinates of a UI element. UDim2s are immutable, so they
+# can be shared and compared freely.
 class UDim2():
-    # Individual co-ordinate class.
-    class Coord():
-        # Construct a new co-ordinate.
-        def __init__(self, scale, offset):
-            self.scale = scale
-            self.offset = offset
+    # Individual co-ordinate, only created when accessing x or y.
+    Coord = namedtuple("Coord", ["scale", "offset"])
+
+    # Store the components in slots rather than a dictionary.
+    __slots__ = ("x_scale", "x_offset", "y_scale", "y_offset")
 
     # Construct a new UDim2.
     def __init__(self, x_scale, x_offset, y_scale, y_offset):
-        self.x = UDim2.Coord(x_scale, x_offset)
-        self.y = UDim2.Coord(y_scale, y_offset)
+        object.__setattr__(self, "x_scale", x_scale)
+        object.__setattr__(self, "x_offset", x_offset)
+        object.__setattr__(self, "y_scale", y_scale)
+        object.__setattr__(self, "y_offset", y_offset)
+
+    # Prevent this UDim2 from being modified.
+    def __setattr__(self, name, value):
+        raise AttributeError("UDim2 is immutable")
+
+    # Get the x co-ordinate.
+    @property
+    def x(self):
+        return UDim2.Coord(self.x_scale, self.x_offset)
+
+    # Get the y co-ordinate.
+    @property
+    def y(self):
+        return UDim2.Coord(self.y_scale, self.y_offset)
+
+    # Resolve this UDim2 into absolute co-ordinates for a given resolution.
+    def resolve(self, width, height):
+        return (width * self.x_scale + self.x_offset,
+                height * self.y_scale + self.y_offset)
 
     # Addition.
     def __add__(self, other):
-        return UDim2(self.x.scale + other.y.scale,
-                     self.x.offset + other.x.offset,
-                     self.y.scale + other.y.scale,
-                     self.y.offset + other.y.offset)
+        return UDim2(self.x_scale + other.x_scale,
+                     self.x_offset + other.x_offset,
+                     self.y_scale + other.y_scale,
+                     self.y_offset + other.y_offset)
 
     # Subtraction.
     def __sub__(self, other):
-        return UDim2(self.x.scale - other.y.scale,
-                     self.x.offset - other.x.offset,
-                     self.y.scale - other.y.scale,
-                     self.y.offset - other.y.offset)
+        return UDim2(self.x_scale - other.x_scale,
+                     self.x_offset - other.x_offset,
+                     self.y_scale - other.y_scale,
+                     self.y_offset - other.y_offset)
     
     # Multiplication.
     def __mul__(self, other):
-        return UDim2(self.x.scale * other.y.scale,
-                     self.x.offset * other.x.offset,
-                     self.y.scale * other.y.scale,
-                     self.y.offset * other.y.offset)
+        return UDim2(self.x_scale * other.x_scale,
+                     self.x_offset * other.x_offset,
+                     self.y_scale * other.y_scale,
+                     self.y_offset * other.y_offset)
     
     # Division.
-    def __div__(self, other):
-        return UDim2(self.x.scale / other.y.scale,
-                     self.x.offset / other.x.offset,
-                     self.y.scale / other.y.scale,
-                     self.y.offset / other.y.offset)
+    def __truediv__(self, other):
+        return UDim2(self.x_scale / other.x_scale,
+                     self.x_offset / other.x_offset,
+                     self.y_scale / other.y_scale,
+                     self.y_offset / other.y_offset)
 
     # Negation.
     def __neg__(self):
-        return UDim2(-self.x.scale,
-                     -self.x.offset,
-                     -self.y.scale,
-                     -self.y.offset)
+        return UDim2(-self.x_scale,
+                     -self.x_offset,
+                     -self.y_scale,
+                     -self.y_offset)
     
     # Unary positive.
     def __pos__(self):
-        return UDim2.new(self.x.scale,
-                         self.x.offset,
-                         self.y.scale,
-                         self.y.offset)
+        return self
     
     # Check if this is equal to the other UDim2.
     def __eq__(self, other):
-        return (self.x.scale == other.x.scale
-                and self.x.offset == other.x.offset
-                and self.y.scale == other.y.scale
-                and self.y.offset == other.y.offset)
+        if not isinstance(other, UDim2):
+            return NotImplemented
+        return (self.x_scale == other.x_scale
+                and self.x_offset == other.x_offset
+                and self.y_scale == other.y_scale
+                and self.y_offset == other.y_offset)
     
     # Check if this is not equal to the other UDim2.
     def __ne__(self, other):
-        return (self.x.scale != other.x.scale
-                or self.x.offset != other.x.offset
-                or self.y.scale != other.y.scale
-                or self.y.offset != other.y.offset)
\ No newline at end of file
+        if not isinstance(other, UDim2):
+            return NotImplemented
+        return not self == other
+
+    # Hash this UDim2, so that it can be used as a key.
+    def __hash__(self):
+        return hash((self.x_scale, self.x_offset, self.y_scale, self.y_offset))
+
+    # Retrieve the string representation of this UDim2.
+    def __repr__(self):
+        return f"UDim2({self.x_scale}, {self.x_offset}, {self.y_scale}, {self.y_offset})"
@@ -64,6 +64,7 @@ class LostLevels(engine.Game):
         self._engine.register_classname("pipetop", sprites.PipeTop)
 
         # Declare all the status bar's elements.
+        self.statusbar = None
         self.scorebox = None
         self.livesbox = None
         self.coin = None
@@ -198,7 +199,7 @@ class LostLevels(engine.Game):
     def create_statusbar(self):
         # Create the score textbox.
         self.scorebox = self._engine.create_ui_element_by_class("text")
-        self.scorebox.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.scorebox.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.scorebox.set_size(engine.ui.UDim2(0, 200, 0, 100))
         self.scorebox.set_position(engine.ui.UDim2(0, 25, 0, 25))
         self.scorebox.set_text("FREEMAN\n0000000000")
@@ -207,7 +208,7 @@ class LostLevels(engine.Game):
 
         # Create the coins textbox.
         self.coinsbox = self._engine.create_ui_element_by_class("text")
-        self.coinsbox.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.coinsbox.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.coinsbox.set_size(engine.ui.UDim2(0, 75, 0, 100))
         self.coinsbox.set_position(engine.ui.UDim2(0.5, -100, 0, 37))
         self.coinsbox.set_text("x00")
@@ -223,7 +224,7 @@ class LostLevels(engine.Game):
 
         # Create the lives textbox.
         self.livesbox = self._engine.create_ui_element_by_class("text")
-        self.livesbox.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.livesbox.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.livesbox.set_size(engine.ui.UDim2(0, 75, 0, 100))
         self.livesbox.set_position(engine.ui.UDim2(0.5, -38, 0, 25))
         self.livesbox.set_text(f"LIVES\n{self.save.header.m_sLives}")
@@ -233,7 +234,7 @@ class LostLevels(engine.Game):
 
         # Create the world textbox.
         self.worldbox = self._engine.create_ui_element_by_class("text")
-        self.worldbox.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.worldbox.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.worldbox.set_size(engine.ui.UDim2(0, 75, 0, 100))
         self.worldbox.set_position(engine.ui.UDim2(0.5, 84, 0, 25))
         self.worldbox.set_text("WORLD\nSELECT")
@@ -243,7 +244,7 @@ class LostLevels(engine.Game):
 
         # Create the time textbox.
         self.timebox = self._engine.create_ui_element_by_class("text")
-        self.timebox.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.timebox.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.timebox.set_size(engine.ui.UDim2(0, 75, 0, 100))
         self.timebox.set_position(engine.ui.UDim2(1, -86, 0, 25))
         self.timebox.set_text("TIME")
@@ -251,6 +252,15 @@ class LostLevels(engine.Game):
         self.timebox.set_x_align(engine.ui.X_CENTRE)
         self.timebox.enabled = True
 
+        # Composite the status bar's elements through a single HUD, so that only
+        # the elements that changed are redrawn.
+        self.statusbar = self._engine.create_ui_element_by_class("hud")
+        self.statusbar.set_size(engine.ui.UDim2(1, 0, 0, 125))
+        self.statusbar.enabled = True
+        for elem in [self.scorebox, self.coinsbox, self.coin, self.livesbox,
+                     self.worldbox, self.timebox]:
+            self.statusbar.add(elem)
+
     # Tweak the melody channel's pitch.
     def __tweak_melody(self):
         if self.__melody != None:
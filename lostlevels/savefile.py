@@ -77,4 +77,12 @@ class LLSV():
 
             # Write the current level for each world.
             for level in self.currentlevel:
-                file.write(level.to_bytes(1, "little"))
\ No newline at end of file
+                file.write(level.to_bytes(1, "little"))
+
+# List the names of all the save files in a directory, sorted by name. The save
+# files themselves are not read, so that they can be read lazily instead.
+def list_saves(savedir = ""):
+    if not os.path.isdir(savedir):
+        return []
+    return sorted(os.path.splitext(entry.name)[0] for entry in os.scandir(savedir)
+                  if entry.is_file() and entry.name.endswith(".sav"))
@@ -23,12 +23,19 @@ class Level(engine.Game):
         self.audio_intro = None
         self.audio_main = None
 
+        # Size the grid cells for the map tiles, so that a 32x32 tile rarely spans
+        # more than one cell, and long merged platforms fit in the top grid level.
+        self._engine.set_cell_size((96, 96))
+
         # Generate the world by calling the module's load_leveldata() function.
         self.leveldata = game.levelmodule.load_leveldata(self._engine, self, section)
         if not self.leveldata:
             self._engine.console.error(
                 f"[Lost Levels]: invalid section name \"{section}\" for world {game.world}-{game.level}!")
 
+        # Merge the tiles of the level into larger colliders.
+        self._engine.merge_colliders()
+
         # Create the player entity at the given offset.
         self.player = self._engine.create_entity_by_class("player")
         self.player.set_baseorigin(offset if offset else self.leveldata.player_offset)
@@ -56,7 +63,7 @@ class Level(engine.Game):
         # Create a prompt dialogue for when the player hits the ESC key
         # for the first time.
         self.esc_prompt = self._engine.create_ui_element_by_class("text")
-        self.esc_prompt.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.esc_prompt.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.esc_prompt.set_size(engine.ui.UDim2(1, 0, 0, 20))
         self.esc_prompt.set_position(engine.ui.UDim2(0, 0, 1, -50))
         self.esc_prompt.set_text("HIT ESC AGAIN TO RETURN TO LEVEL SELECTION")
@@ -108,12 +115,10 @@ class Level(engine.Game):
     # Scroll the map.
     def scroll_map(self):
         # Set the displacement of all entities.
-        ent = self._engine.entity_head()
-        while ent:
+        for ent in self._engine.registry.entities:
             # If this is the left wall, scroll it with the player.
             if ent == self.leftwall:
                 ent.set_baseorigin(pygame.math.Vector2(self.camoffset - 10, 0))
-                ent = ent.next
                 continue
 
             # If this entity is not active, check if it should be activated.
@@ -129,10 +134,10 @@ class Level(engine.Game):
                 if ent.get_abstopright().x < -576:
                     self._engine.delete_entity(ent)
 
-            # Go to the next entity.
-            ent = ent.next
-
-        # Scroll the background slowly based on the camera offset.
+        # Scroll the background slowly based on the camera offset, unless the
+        # quality governor has turned off parallax.
+        if self._engine.quality.get() < engine.governor.QUALITY_PARALLAX:
+            return
         background_offset = self.camoffset / 3
         self.backgroundmain.set_position(
             engine.ui.UDim2(0, ((-background_offset + 1152) % 2304) - 1152, 0, 0))
@@ -7,6 +7,8 @@ from .. import levelinfo
 
 # World portal.
 class WorldPortal(engine.entity.Tile):
+    __slots__ = ("world",)
+
     # Construct the world portal entity.
     def __init__(self, engine, classname):
         # Call the tile constructor and add new properties.
@@ -37,6 +39,9 @@ class LevelSelection(engine.Game):
         self.music.volume = 1
         self.music.play(True)
 
+        # Size the grid cells for the few, large entities of this map.
+        self._engine.set_cell_size((128, 128))
+
         # Create an invisible rectangle for the ground.
         self.ground = self._engine.create_entity_by_class("rect")
         self.ground.set_hitbox(pygame.math.Vector2(576, 65))
@@ -30,7 +30,7 @@ class LoadingLevel(engine.Game):
             # Instead, generate a prompt to the end-user where they
             # have to manually type in a level number instead.
             self.help = self._engine.create_ui_element_by_class("text")
-            self.help.load_localfont("lostlevels/assets/fonts/nes.ttf")
+            self.help.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
             self.help.set_size(engine.ui.UDim2(0, 500, 0, 100))
             self.help.set_position(engine.ui.UDim2(0.5, -250, 0.5, -120))
             self.help.set_text(f"PLEASE TYPE A LEVEL NUMBER FROM 1-{levelinfo.NUM_LEVELS}")
@@ -41,7 +41,7 @@ class LoadingLevel(engine.Game):
 
             # Create the actual textbox itself.
             self.input = self._engine.create_ui_element_by_class("text")
-            self.input.load_localfont("lostlevels/assets/fonts/nes.ttf")
+            self.input.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
             self.input.set_size(engine.ui.UDim2(0, 500, 0, 20))
             self.input.set_position(engine.ui.UDim2(0.5, -250, 0.5, 20))
             self.input.set_text(f"1")
@@ -82,7 +82,7 @@ class LoadingLevel(engine.Game):
         
         # Create a textlabel for presenting the level to the player.
         worldname = self._engine.create_ui_element_by_class("text")
-        worldname.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        worldname.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         worldname.set_size(engine.ui.UDim2(0, 150, 0, 20))
         worldname.set_position(engine.ui.UDim2(0.5, -75, 0.5, -50))
         worldname.set_text(f"WORLD {self.__game.world}-{self.__game.level}")
@@ -99,7 +99,7 @@ class LoadingLevel(engine.Game):
         
         # Create an "x" for the lives counter.
         x = self._engine.create_ui_element_by_class("text")
-        x.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        x.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         x.set_size(engine.ui.UDim2(0, 12, 0, 12))
         x.set_position(engine.ui.UDim2(0.5, -6, 0.5, -6))
         x.set_text("X")
@@ -109,7 +109,7 @@ class LoadingLevel(engine.Game):
 
         # Create a textlabel for the number of lives.
         lives = self._engine.create_ui_element_by_class("text")
-        lives.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        lives.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         lives.set_size(engine.ui.UDim2(0, 100, 0, 12))
         lives.set_position(engine.ui.UDim2(0.5, -53, 0.5, -6))
         lives.set_text(f"{self.__game.save.header.m_sLives}")
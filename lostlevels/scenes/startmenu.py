@@ -8,6 +8,9 @@ import engine
 
 from .. import savefile
 
+# Offset of the selector from the selected button.
+SELECTOR_OFFSET = engine.ui.UDim2(0, 20, 0, 0)
+
 # Save text element.
 class SaveText(engine.ui.Text):
     # Construct the save text element.
@@ -43,7 +46,7 @@ class StartMenu(engine.Game):
 
         # Create the new save button.
         self.newsave = self._engine.create_ui_element_by_class("text")
-        self.newsave.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.newsave.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.newsave.set_size(engine.ui.UDim2(0, 200, 0, 20))
         self.newsave.set_position(engine.ui.UDim2(0.5, -100, 0.5, 0))
         self.newsave.set_text("NEW SAVE")
@@ -54,7 +57,7 @@ class StartMenu(engine.Game):
 
         # Create the load save button.
         self.loadsave = self._engine.create_ui_element_by_class("text")
-        self.loadsave.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.loadsave.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.loadsave.set_size(engine.ui.UDim2(0, 200, 0, 20))
         self.loadsave.set_position(engine.ui.UDim2(0.5, -100, 0.5, 20))
         self.loadsave.set_text("LOAD SAVE")
@@ -65,7 +68,7 @@ class StartMenu(engine.Game):
 
         # Create the help button.
         self.help = self._engine.create_ui_element_by_class("text")
-        self.help.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.help.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.help.set_size(engine.ui.UDim2(0, 200, 0, 20))
         self.help.set_position(engine.ui.UDim2(0.5, -100, 0.5, 40))
         self.help.set_text("HELP!")
@@ -76,7 +79,7 @@ class StartMenu(engine.Game):
 
         # Create the quit button.
         self.quit = self._engine.create_ui_element_by_class("text")
-        self.quit.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.quit.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.quit.set_size(engine.ui.UDim2(0, 200, 0, 20))
         self.quit.set_position(engine.ui.UDim2(0.5, -100, 0.5, 60))
         self.quit.set_text("QUIT")
@@ -98,7 +101,7 @@ class StartMenu(engine.Game):
         # Create a text dialogue that appears after 10s if the user
         # does not select a button.
         self.help_dialogue = self._engine.create_ui_element_by_class("text")
-        self.help_dialogue.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.help_dialogue.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.help_dialogue.set_size(engine.ui.UDim2(0, 200, 0, 100))
         self.help_dialogue.set_position(engine.ui.UDim2(1, -220, 0.5, -14))
         self.help_dialogue.set_text("USE THE ARROW\nKEYS AND HIT\nENTER TO" \
@@ -114,7 +117,7 @@ class StartMenu(engine.Game):
         # Create a text element for the help page, which is disabled by
         # default.
         self.help_page = self._engine.create_ui_element_by_class("text")
-        self.help_page.load_localfont("lostlevels/assets/fonts/nes.ttf", 11)
+        self.help_page.load_bitmapfont("lostlevels/assets/fonts/nes.ttf", 11)
         self.help_page.set_size(engine.ui.UDim2(1, -75, 0, 300))
         self.help_page.set_position(engine.ui.UDim2(0, 37, 0.5, 0))
         self.help_page.set_text("- USE UP AND DOWN KEYS TO NAVIGATE ON A MENU\n\n"  \
@@ -132,7 +135,7 @@ class StartMenu(engine.Game):
 
         # Create a helper dialogue for inputting the new save, disabled by default.
         self.newsave_help = self._engine.create_ui_element_by_class("text")
-        self.newsave_help.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.newsave_help.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.newsave_help.set_size(engine.ui.UDim2(0, 400, 0, 32))
         self.newsave_help.set_position(engine.ui.UDim2(0.5, -200, 0.5, 0))
         self.newsave_help.set_text("INPUT YOUR NEW SAVE NAME BELOW:")
@@ -141,7 +144,7 @@ class StartMenu(engine.Game):
 
         # Create a text box for inputting the new save, disabled by default.
         self.newsave_box = self._engine.create_ui_element_by_class("text")
-        self.newsave_box.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.newsave_box.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.newsave_box.set_size(engine.ui.UDim2(1, -100, 0, 20))
         self.newsave_box.set_position(engine.ui.UDim2(0, 50, 0.5, 32))
         self.newsave_box.set_text("")
@@ -157,7 +160,7 @@ class StartMenu(engine.Game):
 
         # Create a helper dialogue for the load save page.
         self.loadsave_help =  self._engine.create_ui_element_by_class("text")
-        self.loadsave_help.load_localfont("lostlevels/assets/fonts/nes.ttf")
+        self.loadsave_help.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
         self.loadsave_help.set_size(engine.ui.UDim2(0, 400, 0, 72))
         self.loadsave_help.set_position(engine.ui.UDim2(0.5, -200, 0.5, 0))
         self.loadsave_help.set_text("SCROLL UP AND DOWN AND HIT ENTER\nTO LOAD A SAVE.\n\n" \
@@ -165,29 +168,38 @@ class StartMenu(engine.Game):
         self.loadsave_help.set_colour(pygame.Color(255, 255, 255))
         self.loadsave_help.set_x_align(engine.ui.X_CENTRE)
 
-    # Per-frame code.
-    def per_frame(self):
-        # If we are in the load save page, scroll buttons based on the selector's
-        # position.
-        if self.loadsave_help.enabled:
-            for i, button in enumerate(self.buttons):
-                # Position the button based on where we are in the list.
-                topindex = (self.selected_index // 4) * 4
-                button.set_position(engine.ui.UDim2(
-                    0.5, -175, 0.5, 72 + (i - topindex) * 20))
-                
-                # Toggle the button's visiblity if it is in the top 4.
-                button.enabled = topindex <= i < topindex + 4
-        
-        # Move the selector so that it is aligned with the button
-        # currently selected.
-        if self.loadsave_help.enabled:
-            self.selector.set_position(self.buttons[self.selected_index].get_position()
-                                    - engine.ui.UDim2(0, 20, 0, 0))
+        # Create a virtualized list for the load save page, which only creates
+        # elements for the 4 saves that are visible at a time.
+        self.savelist = self._engine.create_ui_element_by_class("listview")
+        self.savelist.set_position(engine.ui.UDim2(0.5, -175, 0.5, 72))
+        for i in range(0, 4):
+            row = self._engine.create_ui_element_by_class("savetext")
+            row.load_bitmapfont("lostlevels/assets/fonts/nes.ttf")
+            row.set_size(engine.ui.UDim2(0, 350, 0, 20))
+            row.set_colour(pygame.Color(255, 255, 255))
+            row.set_x_align(engine.ui.X_CENTRE)
+            row.get_event("selected").set_func(lambda elem: self.save_loaded(elem))
+            self.savelist.add_row(row)
+
+        # The names of all the save files, and the saves that have been read so far.
+        self.savenames = []
+        self.saves = dict()
+
+        # Position the selector next to the first button.
+        self.layout_buttons()
+
+    # Position the selector next to the selected button. This only needs to be
+    # called when the selection or the buttons change, rather than every frame.
+    def layout_buttons(self):
+        if self.savelist.enabled:
+            self.selector.set_position(self.savelist.get_selected_row().get_position()
+                                    - SELECTOR_OFFSET)
         else:
             self.selector.set_position(self.buttons[self.selected_index].get_position()
-                                    + engine.ui.UDim2(0, 20, 0, 0))
-        
+                                    + SELECTOR_OFFSET)
+
+    # Per-frame code.
+    def per_frame(self):
         # Show the help dialogue if it has been 10s since launching and if we
         # have not previously selected a button.
         if time.perf_counter() - self.launch > 10 and not self.selected:
@@ -197,11 +209,17 @@ class StartMenu(engine.Game):
     def keyup(self, enum, unicode, focused):
         # Move the selector up if the key pressed is the up arrow key.
         if enum == pygame.K_UP:
-            self.selected_index = (self.selected_index - 1) % len(self.buttons)
+            if self.savelist.enabled:
+                self.savelist.select(self.savelist.get_selected() - 1)
+            else:
+                self.selected_index = (self.selected_index - 1) % len(self.buttons)
         
         # Move the selector down if the key pressed is the down arrow key.
         elif enum == pygame.K_DOWN:
-            self.selected_index = (self.selected_index + 1) % len(self.buttons)
+            if self.savelist.enabled:
+                self.savelist.select(self.savelist.get_selected() + 1)
+            else:
+                self.selected_index = (self.selected_index + 1) % len(self.buttons)
 
         # Select this button if we hit enter.
         elif enum == pygame.K_RETURN:
@@ -213,6 +231,10 @@ class StartMenu(engine.Game):
             elif self.newsave_box.enabled:
                 pass
             
+            # This is a save, select it instead.
+            elif self.savelist.enabled:
+                self.savelist.get_selected_row().invoke_event("selected")
+
             # This is a button, select it instead.
             else:
                 self._engine.console.log(
@@ -224,19 +246,18 @@ class StartMenu(engine.Game):
         # Return back to the main menu if ESC was pressed and we are in the 
         # load save page.
         elif enum == pygame.K_ESCAPE and self.loadsave_help.enabled:
-            # Delete all the save buttons and disable the load save helper 
-            # dialogue.
+            # Disable the save list and the load save helper dialogue.
             self.loadsave_help.enabled = False
-            for button in self.buttons:
-                self._engine.delete_ui_element(button)
+            self.savelist.enabled = False
             
             # Re-toggle the main menu buttons.
-            self.buttons = [self.newsave, self.loadsave, self.help,
-                        self.quit]
             for button in self.buttons:
                 button.enabled = True
             self.selected_index = 0
 
+        # Re-position the buttons and selector, as the selection may have changed.
+        self.layout_buttons()
+
     # Create a new save.
     def input_newsave(self):
         # Disable the selector, buttons and help dialogue.
@@ -256,44 +277,44 @@ class StartMenu(engine.Game):
     # Load an existing save, or default to creating a new save if
     # there are no save files.
     def input_loadsave(self):
-        # Query all the save files in the saves directory.
-        files = [save for save in os.listdir("saves") if os.path.isfile(os.path.join("saves", save))]
-        saves = []
-        for file in files:
-            save = savefile.LLSV(os.path.splitext(file)[0])
-            if (error := save.read("saves")):
-                self._engine.console.warn(f"[Lost Levels]: couldn't load save \"{file}\": {error}")
-            else:
-                saves.append(save)
+        # List the save files in the saves directory. These are only read once
+        # they are scrolled into view.
+        self.savenames = savefile.list_saves("saves")
+        self.saves = dict()
 
         # If we don't have any save files, go to the new save prompt 
         # and return.
-        if len(saves) == 0:
+        if len(self.savenames) == 0:
             self.input_newsave()
             return
         
-        # Disable all the main menu buttons and help dialogue, and clear the buttons
-        # array.
+        # Disable all the main menu buttons and help dialogue.
         self.help_dialogue.enabled = False
         for button in self.buttons:
             button.enabled = False
-        self.buttons = []
         
-        # Fill the buttons array with dynamically-created buttons for each save.
-        for i, save in enumerate(saves):
-            button = self._engine.create_ui_element_by_class("savetext")
-            button.load_localfont("lostlevels/assets/fonts/nes.ttf")
-            button.set_size(engine.ui.UDim2(0, 350, 0, 20))
-            button.set_text(f"{i + 1} - {save.name.upper()}")
-            button.set_colour(pygame.Color(255, 255, 255))
-            button.set_x_align(engine.ui.X_CENTRE)
-            button.enabled = True
-            button.save = save
-            button.get_event("selected").set_func(lambda elem: self.save_loaded(elem))
-            self.buttons.append(button)
+        # Show the saves in the save list.
+        self.savelist.set_source(len(self.savenames), self.bind_save)
+        self.savelist.enabled = True
 
         # Enable the load save helper dialogue.
         self.loadsave_help.enabled = True
+
+    # Bind a save to a row of the save list, reading the save file if it hasn't
+    # been read already.
+    def bind_save(self, row, index):
+        # Read the save file if it hasn't been read yet.
+        name = self.savenames[index]
+        if index not in self.saves:
+            save = savefile.LLSV(name)
+            if (error := save.read("saves")):
+                self._engine.console.warn(f"[Lost Levels]: couldn't load save \"{name}.sav\": {error}")
+                save = None
+            self.saves[index] = save
+
+        # Display the save in the row.
+        row.save = self.saves[index]
+        row.set_text(f"{index + 1} - {name.upper()}" + ("" if row.save else " (CORRUPT)"))
                 
     # Toggle the help section.
     def input_help(self):
@@ -330,6 +351,10 @@ class StartMenu(engine.Game):
 
     # Handle loading an existing save.
     def save_loaded(self, elem):
+        # Ignore saves that couldn't be read.
+        if not elem.save:
+            return
+
         # Load the save and therefore load the game.
         self.__game.save = elem.save
         self._engine.console.log(f"[Lost Levels]: loaded save \"{elem.save.name}.sav\"")
@@ -6,6 +6,8 @@ import engine
 
 # The coin class.
 class Coin(engine.entity.Sprite):
+    __slots__ = ("level", "collected")
+
     # Construct a new coin.
     def __init__(self, eng, classname):
         # Call the entity constructor and modify its default properties.
@@ -12,6 +12,8 @@ import engine
 
 # The pipe top class.
 class PipeTop(engine.entity.Tile):
+    __slots__ = ("rotation", "level", "section", "offset", "entered")
+
     # Construct a new pipe top.
     def __init__(self, eng, classname):
         # Call the entity constructor and modify its default properties.
@@ -7,6 +7,9 @@ import time
 
 # The player class.
 class Player(engine.entity.Sprite):
+    __slots__ = ("__jumping", "__speedwhenjumping", "__animtimestamp", "__crouching",
+                 "moveable", "alive", "level")
+
     # Construct a new player.
     def __init__(self, engine, classname):
         # Call the entity constructor and modify its default properties.
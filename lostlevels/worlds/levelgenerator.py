@@ -81,8 +81,10 @@ class LevelGenerator():
         # Generate the tiles.
         ents = self.__generate_tiles("tile", 1, offset, length, height, draw, spiked)
 
-        # Hook the collision and collisionfinal events of each of them.
+        # Hook the collision and collisionfinal events of each of them. These tiles
+        # need their events, so keep them out of the tilemap.
         for ent in ents:
+            ent.tileflags = 0
             ent.get_event("collision").set_func(
                 lambda hit, other, coltype, coldir: self.__destroy_block_collide(hit, other, coltype, coldir))
             ent.get_event("collisionfinal").set_func(
@@ -162,7 +164,9 @@ class LevelGenerator():
     # Generate ropes that you can jump through.
     def generate_rope(self, offset, length = 1, draw = True, spiked = False):
         ents = self.__generate_tiles("tile", 18, offset, length, 1, draw, spiked)
+        # In the tilemap, ropes are one-way tiles instead.
         for ent in ents:
+            ent.tileflags = engine.entity.TILE_ONEWAY | (ent.tileflags & engine.entity.TILE_SPIKED)
             ent.get_event("collision").set_func(
                 lambda hit, other, coltype, coldir: self.__hit_rope(hit, other, coltype, coldir))
         return ents
@@ -183,6 +187,7 @@ class LevelGenerator():
         ents = self.__generate_tiles("tile", 22, offset, length, height, draw, spiked)
         for ent in ents:
             ent.friction = 0.075
+            ent.tileflags |= engine.entity.TILE_ICE
         return ents
     
     # Generate power-up blocks.
@@ -218,6 +223,7 @@ class LevelGenerator():
             tile1.load(f"lostlevels/assets/biomes/{self.__biome}/main.png", (32, 32), 10 + orientation // 2)
             tile1.set_baseorigin(offset + self.__get_pipetile_offset(i * 2, orientation))
             tile1.rotate(-orientation * 90)
+            tile1.tileflags = engine.entity.TILE_SOLID
             ents.append(tile1)
 
             # Create the 2nd entry tile.
@@ -225,6 +231,7 @@ class LevelGenerator():
             tile2.load(f"lostlevels/assets/biomes/{self.__biome}/main.png", (32, 32), 11 - orientation // 2)
             tile2.set_baseorigin(offset + self.__get_pipetile_offset(i * 2 + 1, orientation))
             tile2.rotate(-orientation * 90)
+            tile2.tileflags = engine.entity.TILE_SOLID
             ents.append(tile2)
         
         # Return the tiles.
@@ -249,6 +256,7 @@ class LevelGenerator():
             tile1.load(f"lostlevels/assets/biomes/{self.__biome}/main.png", (32, 32), tile1_index)
             tile1.set_baseorigin(offset + self.__get_pipetile_offset(i * 2, orientation))
             tile1.rotate(-orientation * 90)
+            tile1.tileflags = engine.entity.TILE_SOLID
             ents.append(tile1)
 
             # Create the 2nd entry tile.
@@ -256,6 +264,7 @@ class LevelGenerator():
             tile2.load(f"lostlevels/assets/biomes/{self.__biome}/main.png", (32, 32), tile2_index)
             tile2.set_baseorigin(offset + self.__get_pipetile_offset(i * 2 + 1, orientation))
             tile2.rotate(-orientation * 90)
+            tile2.tileflags = engine.entity.TILE_SOLID
             ents.append(tile2)
         
         # Return the tiles.
@@ -296,7 +305,9 @@ class LevelGenerator():
                 ent.load(f"lostlevels/assets/biomes/{self.__biome}/main.png", (32, 32), index)
                 ent.set_baseorigin(offset + pygame.math.Vector2(x * 32, -y * 32))
                 ent.draw = draw
+                ent.tileflags = engine.entity.TILE_SOLID
                 if spiked:
+                    ent.tileflags |= engine.entity.TILE_SPIKED
                     ent.get_event("collisionfinal").hook(
                         (lambda hit, name, returnValue, other, coltype, coldir: 
                             self.__create_spikes(hit, other)), True)
@@ -333,6 +344,10 @@ class LevelGenerator():
         # If the player has hit this block from below, destroy it!
         if other == self.__level.player and coldir == engine.entity.COLDIR_DOWN:
             self.__engine.delete_entity(ent)
+
+            # Spawn the debris, unless the quality governor has turned it off.
+            if self.__engine.quality.get() < engine.governor.QUALITY_DEBRIS:
+                return
             for i in range(0, 4):
                 block = self.__engine.create_entity_by_class("tile")
                 block.movetype = engine.entity.MOVETYPE_PHYSICS
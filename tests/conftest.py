@@ -0,0 +1,76 @@
+"""Shared fixtures for the engine tests. The engine is run headless, and only
+one engine is created for the whole session, as its console logger can only
+be created once per session."""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+import engine
+import engine.logger
+
+from engine.entity import entity, tilemap
+
+# Create the engine, writing its logs into a temporary directory rather than
+# into the repository.
+@pytest.fixture(scope="session")
+def session_engine(tmp_path_factory):
+    engine.logger.Logger.directory = str(tmp_path_factory.mktemp("logging"))
+    return engine.LLEngine("Tests")
+
+# Get the engine, with every entity cleared and the physics gvars restored.
+@pytest.fixture
+def eng(session_engine):
+    session_engine.clear_entities()
+    session_engine.globals.frametime = 1 / 60
+    for name in ("use_tilemap", "use_component_store"):
+        session_engine.find_gvar(name).set(0)
+    yield session_engine
+    session_engine.clear_entities()
+
+# Get the physics engine of the engine.
+@pytest.fixture
+def physics(eng):
+    return eng._LLEngine__physics
+
+# Get a function that deletes an entity straight away, rather than on the
+# engine's next frame.
+@pytest.fixture
+def delete_now(eng):
+    def delete(ent):
+        eng.delete_entity(ent)
+        eng._LLEngine__delete_entity(ent)
+    return delete
+
+# Get a function that creates a rectangle entity with the given origin, hitbox
+# and movetype, which is activated unless told otherwise.
+@pytest.fixture
+def create(eng):
+    def create(origin, hitbox, movetype = entity.MOVETYPE_ANCHORED, activate = True):
+        ent = eng.create_entity_by_class("rect")
+        ent.movetype = movetype
+        ent.set_hitbox(pygame.math.Vector2(hitbox))
+        ent.set_baseorigin(pygame.math.Vector2(origin))
+        if activate:
+            eng.activate_entity(ent)
+        return ent
+    return create
+
+# Get a function that creates a map tile with the given tile flags, covering the
+# tile cell at a column and row, which is activated unless told otherwise.
+@pytest.fixture
+def create_tile(eng):
+    def create_tile(col, row, flags = tilemap.TILE_SOLID, activate = True):
+        tile = eng.create_entity_by_class("tile")
+        tile.tileflags = flags
+        tile.set_hitbox(pygame.math.Vector2(tilemap.TILE_SIZE, tilemap.TILE_SIZE))
+        tile.set_baseorigin(pygame.math.Vector2(col, row) * tilemap.TILE_SIZE)
+        if activate:
+            eng.activate_entity(tile)
+        return tile
+    return create_tile
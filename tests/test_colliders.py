@@ -0,0 +1,85 @@
+"""Tests for merging map tiles into colliders in the physics engine."""
+
+import pygame
+import pytest
+
+from engine.entity import entity, tilemap
+
+# Get a function that creates a rectangle of solid map tiles, merges them and
+# activates them.
+@pytest.fixture
+def create_tiles(eng, create_tile):
+    def create_tiles(width, height):
+        tiles = [create_tile(col, row, activate = False) for row in range(height) for col in range(width)]
+        eng.merge_colliders()
+        for tile in tiles:
+            eng.activate_entity(tile)
+        return tiles
+    return create_tiles
+
+# Get the colliders of the physics engine, mapped to their tiles.
+def get_colliders(physics):
+    return physics._LLPhysics__colliders
+
+# Get every entity in the grids of the physics engine, without expanding colliders.
+def get_grid_entities(physics):
+    return set(physics._LLPhysics__static.get_entities())
+
+# Get the tile cells covered by a collider.
+def get_cells(collider):
+    origin, hitbox = collider.get_baseorigin(), collider.get_hitbox()
+    size = tilemap.TILE_SIZE
+    return {(int(origin.x // size) + x, int(origin.y // size) - y)
+            for x in range(int(hitbox.x // size)) for y in range(int(hitbox.y // size))}
+
+def test_merged_tiles_are_not_entities(eng, physics, create_tiles):
+    tiles = create_tiles(8, 1)
+    assert len(eng.registry.entities) == len(tiles)
+    assert len(get_colliders(physics)) == 1
+    assert get_grid_entities(physics) == set(get_colliders(physics))
+
+def test_removing_tiles_from_merged_row(eng, physics, delete_now, create_tiles):
+    tiles = create_tiles(8, 1)
+    collider = next(iter(get_colliders(physics)))
+
+    # Removing a tile from the end of the row shrinks the collider.
+    delete_now(tiles[0])
+    assert list(get_colliders(physics)) == [collider]
+    assert get_cells(collider) == {(x, 0) for x in range(1, 8)}
+    assert get_grid_entities(physics) == {collider}
+
+    # Removing a tile from the middle splits it in two.
+    delete_now(tiles[4])
+    assert len(get_colliders(physics)) == 2
+    cells = sorted(sorted(get_cells(other)) for other in get_colliders(physics))
+    assert cells == [[(1, 0), (2, 0), (3, 0)], [(5, 0), (6, 0), (7, 0)]]
+    assert get_grid_entities(physics) == set(get_colliders(physics))
+
+    # Tiles that are left on their own go back into the grids.
+    delete_now(tiles[2])
+    delete_now(tiles[6])
+    assert len(get_colliders(physics)) == 0
+    assert get_grid_entities(physics) == {tiles[1], tiles[3], tiles[5], tiles[7]}
+
+def test_removing_tile_from_merged_block(eng, physics, delete_now, create_tiles):
+    tiles = create_tiles(3, 3)
+
+    # Removing the centre tile leaves a column either side, and a tile above and
+    # below it.
+    delete_now(tiles[4])
+    colliders = get_colliders(physics)
+    assert sorted(len(members) for members in colliders.values()) == [3, 3]
+    for collider, members in colliders.items():
+        assert get_cells(collider) == set(members)
+    assert get_grid_entities(physics) == set(colliders) | {tiles[1], tiles[7]}
+
+def test_collisions_report_merged_tiles(eng, physics, create, create_tiles):
+    tiles = create_tiles(4, 1)
+    ent = create((72, 40), (16, 16), entity.MOVETYPE_PHYSICS)
+    for i in range(30):
+        physics.per_frame()
+    assert ent.groundentity == tiles[2]
+
+    # Queries return the merged tiles rather than the collider.
+    found = eng.query_entities(pygame.math.Vector2(40, 0), pygame.math.Vector2(70, -10))
+    assert set(found) == {tiles[1], tiles[2]}
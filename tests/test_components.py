@@ -0,0 +1,40 @@
+"""Tests for entities whose motion is kept in the component store."""
+
+import pygame
+import pytest
+
+pytest.importorskip("numpy")
+
+# Create an entity whose motion is kept in the component store.
+@pytest.fixture
+def ent(eng):
+    eng.use_component_store.set(1)
+    ent = eng.create_entity_by_class("rect")
+    assert ent._components != None
+    return ent
+
+def test_getters_return_values(ent):
+    ent.set_baseorigin(pygame.math.Vector2(10, 20))
+    ent.set_hitbox(pygame.math.Vector2(32, 32))
+    origin, hitbox = ent.get_baseorigin(), ent.get_hitbox()
+
+    # Values that were read earlier don't follow the entity.
+    ent.set_baseorigin(pygame.math.Vector2(50, 60))
+    ent.set_hitbox(pygame.math.Vector2(64, 16))
+    assert origin == pygame.math.Vector2(10, 20)
+    assert hitbox == pygame.math.Vector2(32, 32)
+    assert ent.get_baseorigin() == pygame.math.Vector2(50, 60)
+    assert ent.get_hitbox() == pygame.math.Vector2(64, 16)
+
+def test_velocity_writes_to_store(ent):
+    ent.velocity.x = 5
+    ent.velocity.y -= 3
+    assert tuple(ent._components.velocity[ent._row]) == (5, -3)
+
+def test_motion_is_kept_when_detached(eng, ent, delete_now):
+    ent.set_baseorigin(pygame.math.Vector2(10, 20))
+    ent.velocity = pygame.math.Vector2(1, 2)
+    delete_now(ent)
+    assert ent._components == None
+    assert ent.get_baseorigin() == pygame.math.Vector2(10, 20)
+    assert ent.velocity == pygame.math.Vector2(1, 2)
@@ -0,0 +1,110 @@
+"""Tests for the spatial hash grids of the physics engine."""
+
+import pygame
+
+from engine.entity import physics as llphysics
+
+# Check that every entity in a grid is recorded at its slot in each of its cells.
+def check_slots(grid):
+    for cell, members in grid.cells.items():
+        for slot, ent in enumerate(members):
+            assert ent.gridhashes[cell] == slot
+
+# Get the index of the level of a hierarchical grid that an entity is in.
+def get_level(grid, ent):
+    return grid.levels.index(ent.grid)
+
+def test_entities_go_into_level_matching_size(eng, physics, create):
+    eng.set_cell_size((64, 64))
+    grid = physics._LLPhysics__static
+    small = create((0, 0), (16, 16))
+    tile = create((0, 0), (64, 64))
+    portal = create((0, 0), (128, 200))
+    platform = create((0, 0), (5000, 64))
+    assert get_level(grid, small) == 0
+    assert get_level(grid, tile) == 0
+    assert get_level(grid, portal) == 2
+    assert get_level(grid, platform) == len(grid.levels) - 1
+
+    # Each entity covers no more than 2x2 cells of its level, except for those
+    # that are too large for every level.
+    for ent in (small, tile, portal):
+        assert len(ent.gridhashes) <= 4
+
+def test_resized_entity_moves_level(eng, physics, create):
+    eng.set_cell_size((64, 64))
+    grid = physics._LLPhysics__static
+    ent = create((0, 0), (32, 32))
+    assert get_level(grid, ent) == 0
+
+    # Growing a static entity moves it to a higher level on the next frame.
+    ent.set_hitbox(pygame.math.Vector2(200, 200))
+    physics.per_frame()
+    assert get_level(grid, ent) == 2
+    assert ent in eng.query_entities(pygame.math.Vector2(150, -150), pygame.math.Vector2(160, -160))
+
+    # Shrinking it moves it back down, out of the cells it no longer covers.
+    ent.set_hitbox(pygame.math.Vector2(32, 32))
+    physics.per_frame()
+    assert get_level(grid, ent) == 0
+    assert ent not in eng.query_entities(pygame.math.Vector2(150, -150), pygame.math.Vector2(160, -160))
+
+def test_set_cell_size_keeps_entities(eng, physics, create):
+    ents = [create((i * 40, 0), (32, 32)) for i in range(5)]
+    eng.set_cell_size((96, 96))
+    assert physics._LLPhysics__static.levels[0].get_cell_size() == pygame.math.Vector2(96, 96)
+    found = eng.query_entities(pygame.math.Vector2(0, 0), pygame.math.Vector2(200, -32))
+    assert set(found) == set(ents)
+
+def test_clear_entities_restores_cell_size(eng, physics):
+    eng.set_cell_size((96, 96))
+    eng.clear_entities()
+    cellsize = physics._LLPhysics__static.levels[0].get_cell_size()
+    assert cellsize == pygame.math.Vector2(llphysics.CELL_SIZE)
+
+def test_remove_swaps_last_entity_into_slot(create):
+    grid = llphysics.SpatialHashGrid(pygame.math.Vector2(64, 64))
+    ents = [create((i * 4, 32), (8, 8), activate = False) for i in range(4)]
+    for ent in ents:
+        grid.insert(ent)
+    assert grid.cells[(0, 0)] == ents
+
+    # The last entity of the cell takes the slot of the removed entity.
+    grid.remove(ents[1])
+    assert grid.cells[(0, 0)] == [ents[0], ents[3], ents[2]]
+    assert ents[1].grid == None and ents[1].gridhashes == None
+    check_slots(grid)
+
+    # The cell is deleted once it is empty.
+    for ent in (ents[0], ents[2], ents[3]):
+        grid.remove(ent)
+        check_slots(grid)
+    assert (0, 0) not in grid.cells
+
+def test_update_only_changes_cells_left_or_entered(create):
+    grid = llphysics.SpatialHashGrid(pygame.math.Vector2(64, 64))
+    other = create((0, 32), (16, 16), activate = False)
+    ent = create((8, 32), (16, 16), activate = False)
+    grid.insert(other)
+    grid.insert(ent)
+
+    # Moving within the same cell leaves the cells alone.
+    ent.set_baseorigin(pygame.math.Vector2(30, 40))
+    grid.update(ent)
+    assert grid.cells == {(0, 0): [other, ent]}
+    assert ent.gridhashes == {(0, 0): 1}
+    assert not ent.dirty
+
+    # Moving across a cell boundary only adds the cell that was entered, keeping
+    # the entity's slot in the cell it is still in.
+    ent.set_baseorigin(pygame.math.Vector2(56, 40))
+    grid.update(ent)
+    assert grid.cells == {(0, 0): [other, ent], (1, 0): [ent]}
+    assert ent.gridhashes == {(0, 0): 1, (1, 0): 0}
+
+    # Leaving a cell only removes the entity from that cell.
+    ent.set_baseorigin(pygame.math.Vector2(70, 40))
+    grid.update(ent)
+    assert grid.cells == {(0, 0): [other], (1, 0): [ent]}
+    assert ent.gridhashes == {(1, 0): 0}
+    check_slots(grid)
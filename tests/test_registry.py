@@ -0,0 +1,47 @@
+"""Tests for the entity registry."""
+
+import engine
+
+# Check that every entity in the registry's dense list knows its index.
+def check_indexes(registry):
+    for index, ent in enumerate(registry.entities):
+        assert ent._index == index
+
+def test_remove_swaps_last_entity_into_place():
+    registry = engine.entity.EntityRegistry()
+    ents = [engine.entity.Entity(None) for i in range(5)]
+    for ent in ents:
+        registry.add(ent)
+
+    registry.remove(ents[1])
+    assert registry.entities == [ents[0], ents[4], ents[2], ents[3]]
+    check_indexes(registry)
+
+    registry.remove(ents[3])
+    assert registry.entities == [ents[0], ents[4], ents[2]]
+    check_indexes(registry)
+    assert ents[1]._index == None and ents[3]._index == None
+    assert registry.count(False) == 3
+
+def test_removed_ids_are_not_resolved():
+    registry = engine.entity.EntityRegistry()
+    first = engine.entity.Entity(None)
+    registry.add(first)
+    entid = first.entid
+    registry.remove(first)
+
+    # The handle is reused, but the old id doesn't resolve to the new entity.
+    second = engine.entity.Entity(None)
+    registry.add(second)
+    assert registry.get(entid) == None
+    assert registry.get(second.entid) == second
+
+def test_draw_order_is_kept_after_removal(eng, delete_now):
+    ents = [eng.create_entity_by_class("rect") for i in range(4)]
+    delete_now(ents[0])
+    order = []
+    ent = eng.entity_head()
+    while ent:
+        order.append(ent)
+        ent = ent.next
+    assert order == ents[1:]
@@ -0,0 +1,41 @@
+"""Tests for the physics substeps taken in each frame."""
+
+import pygame
+import pytest
+
+from engine.entity import entity, physics as llphysics
+
+def test_short_frame_takes_one_substep(eng, physics, create):
+    body = create((0, 0), (16, 16), entity.MOVETYPE_PHYSICS)
+    body.velocity = pygame.math.Vector2(100, 0)
+    total = eng.globals.skipped_total
+    physics.per_frame()
+    assert eng.globals.substeps == 1
+    assert eng.globals.skipped_time == 0
+    assert eng.globals.skipped_total == total
+
+def test_long_frame_is_split_into_max_steps(eng, physics, create):
+    create((0, 0), (16, 16), entity.MOVETYPE_PHYSICS)
+    eng.globals.frametime = 0.05
+    physics.per_frame()
+    assert eng.globals.substeps == 2
+    assert eng.globals.skipped_time == 0
+
+def test_fast_body_adds_substeps(eng, physics, create):
+    # The body moves 2.5 times its own width in a frame.
+    body = create((0, 0), (16, 16), entity.MOVETYPE_PHYSICS)
+    body.velocity = pygame.math.Vector2(2400, 0)
+    physics.per_frame()
+    assert eng.globals.substeps == 3
+
+def test_substeps_are_capped(eng, physics, create):
+    create((0, 0), (16, 16), entity.MOVETYPE_PHYSICS)
+    total = eng.globals.skipped_total
+    eng.globals.frametime = 1.0
+    physics.per_frame()
+
+    # The frame time beyond the capped substeps is skipped and reported.
+    substeps, maxstep = llphysics.DEFAULT_MAXSUBSTEPS, llphysics.DEFAULT_MAXSTEP
+    assert eng.globals.substeps == substeps
+    assert eng.globals.skipped_time == pytest.approx(1.0 - substeps * maxstep)
+    assert eng.globals.skipped_total == pytest.approx(total + 1.0 - substeps * maxstep)
@@ -0,0 +1,71 @@
+"""Tests for the swept AABB collisions of the physics engine."""
+
+import pygame
+import pytest
+
+from engine.entity import entity, tilemap
+from engine.entity.physics import sweep
+
+def test_sweep_time_of_impact():
+    assert sweep((0, 0, 10, 10), (20, 0, 30, 10), 20, 0) == (0.5, True)
+    assert sweep((0, 20, 10, 30), (0, 0, 10, 10), 0, -40) == (0.25, False)
+
+    # The axis that starts overlapping last is the one that is hit.
+    assert sweep((0, 20, 10, 30), (15, 0, 25, 10), 10, -20) == (0.5, False)
+
+def test_sweep_misses():
+    # Moving away, falling short and passing by don't meet.
+    assert sweep((0, 0, 10, 10), (20, 0, 30, 10), -20, 0) == None
+    assert sweep((0, 0, 10, 10), (20, 0, 30, 10), 5, 0) == None
+    assert sweep((0, 20, 10, 30), (20, 0, 30, 10), 0, -40) == None
+
+    # Neither do boxes that already overlap, slide along each other or only touch
+    # at a corner.
+    assert sweep((0, 0, 10, 10), (5, 5, 15, 15), 10, 0) == None
+    assert sweep((0, 10, 10, 20), (0, 0, 50, 10), 20, 0) == None
+    assert sweep((0, 10, 10, 20), (20, 0, 30, 10), 10, 0) == None
+
+@pytest.mark.parametrize("use_tilemap", (0, 1))
+def test_fast_body_does_not_tunnel(eng, physics, create, create_tile, use_tilemap):
+    if use_tilemap:
+        pytest.importorskip("numpy")
+    eng.find_gvar("use_tilemap").set(use_tilemap)
+    tile = create_tile(0, 0)
+    body = create((8, 200), (16, 16), entity.MOVETYPE_PHYSICS)
+
+    # The body moves much further than the tile's height in a single frame.
+    body.velocity = pygame.math.Vector2(0, -30000)
+    physics.per_frame()
+    assert body.get_baseorigin() == pygame.math.Vector2(8, 16)
+    assert body.velocity.y == 0
+    assert body.groundentity == tile
+
+def test_body_slides_along_floor(physics, create, create_tile):
+    for col in range(4):
+        create_tile(col, 0)
+    body = create((8, 18), (16, 16), entity.MOVETYPE_PHYSICS)
+
+    # The body lands partway through the frame, and slides the rest of the way.
+    body.velocity = pygame.math.Vector2(300, -300)
+    physics.per_frame()
+    assert body.get_baseorigin() == pygame.math.Vector2(13, 16)
+    assert body.velocity == pygame.math.Vector2(300, 0)
+
+def test_oneway_tile_only_blocks_from_above(eng, physics, create, create_tile):
+    pytest.importorskip("numpy")
+    eng.find_gvar("use_tilemap").set(1)
+    tile = create_tile(0, 0, tilemap.TILE_ONEWAY)
+
+    # Jumping up through the tile passes through it.
+    body = create((8, -40), (16, 16), entity.MOVETYPE_PHYSICS)
+    body.velocity = pygame.math.Vector2(0, 3000)
+    physics.per_frame()
+    assert body.get_baseorigin().y > 0
+    assert body.groundentity == None
+
+    # Falling onto it lands on top.
+    body.set_baseorigin(pygame.math.Vector2(8, 60))
+    body.velocity = pygame.math.Vector2(0, -3000)
+    physics.per_frame()
+    assert body.get_baseorigin() == pygame.math.Vector2(8, 16)
+    assert body.groundentity == tile
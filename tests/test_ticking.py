@@ -0,0 +1,36 @@
+"""Tests for the entities that are ticked each frame."""
+
+from engine.entity.entity import idle
+
+# Subscribe an entity to ticking, recording the order it is ticked in.
+def subscribe(ent, order):
+    ent.get_event("per_frame").set_func(lambda ent: order.append(ent))
+
+def test_idle_entities_are_not_ticked(eng):
+    ent = eng.create_entity_by_class("rect")
+    assert ent not in eng.registry.get_ticking()
+
+def test_tick_order_is_creation_order(eng):
+    ents = [eng.create_entity_by_class("rect") for i in range(4)]
+    order = []
+
+    # Subscribe the entities out of creation order.
+    for i in (2, 0, 3, 1):
+        subscribe(ents[i], order)
+    for ent in eng.registry.get_ticking():
+        ent.invoke_event("per_frame")
+    assert order == ents
+
+def test_tick_order_after_resubscribing(eng):
+    ents = [eng.create_entity_by_class("rect") for i in range(3)]
+    order = []
+    for ent in ents:
+        subscribe(ent, order)
+
+    # Unsubscribe the first entity and subscribe it again.
+    ents[0].get_event("per_frame").set_func(idle)
+    assert ents[0] not in eng.registry.get_ticking()
+    subscribe(ents[0], order)
+    for ent in eng.registry.get_ticking():
+        ent.invoke_event("per_frame")
+    assert order == ents